@@ -0,0 +1 @@
+"""Performance benchmarks for sandbox components and scenes, run by `mmake bench`."""
@@ -0,0 +1,182 @@
+from manim import *
+
+from manim_sandbox.benchmarks.runner import benchmark, register
+from manim_sandbox.common.compound_objects import (
+    AnalogClock,
+    DotWithLocalGrid,
+    TwoOpposingWalls,
+)
+from manim_sandbox.common.factory import cached, default_factory
+from manim_sandbox.spacetime.relativity.time_dilation import LightClock, PhotonTrace
+
+# Frames simulated by the per-frame benchmarks
+FRAME_RATE = 60
+FRAMES = 120
+
+
+def _frames(count=FRAMES):
+    dt = 1 / FRAME_RATE
+    return ((i + 1) * dt for i in range(count)), dt
+
+
+# Constructors
+
+
+@benchmark("construct/dot_with_local_grid")
+def construct_dot_with_local_grid():
+    return lambda: DotWithLocalGrid()
+
+
+def construct_walls(batch_hatches):
+    def setup():
+        return lambda: TwoOpposingWalls(
+            first_midpoint=UP * 2,
+            second_midpoint=DOWN * 2,
+            wall_width=4,
+            hatch_length=0.3,
+            batch_hatches=batch_hatches,
+        )
+
+    return setup
+
+
+register("construct/two_opposing_walls", construct_walls(False))
+register("construct/two_opposing_walls[batched]", construct_walls(True))
+
+
+@benchmark("construct/analog_clock")
+def construct_analog_clock():
+    return lambda: AnalogClock()
+
+
+def construct_light_clock(warm):
+    def setup():
+        if not warm:
+            default_factory.clear()
+        return lambda: LightClock()
+
+    return setup
+
+
+register("construct/light_clock[cold]", construct_light_clock(False))
+register("construct/light_clock[warm]", construct_light_clock(True))
+
+
+def construct_wall_pair(shared):
+    """The walls of two clocks that only differ in color."""
+
+    def build(color):
+        options = dict(
+            first_midpoint=UP * 2,
+            second_midpoint=DOWN * 2,
+            wall_width=1,
+            hatch_length=0.3,
+        )
+        if shared:
+            return cached(TwoOpposingWalls, **options).set_color(color)
+        return TwoOpposingWalls(**options, color=color)
+
+    def setup():
+        default_factory.clear()
+        return lambda: [build(color) for color in (RED, BLUE)]
+
+    return setup
+
+
+register("construct/wall_pair", construct_wall_pair(False))
+register("construct/wall_pair[shared]", construct_wall_pair(True))
+
+
+@benchmark("construct/light_clock_pair")
+def construct_light_clock_pair():
+    """The two clocks of TimeDilationDemo, in different colors and symbols."""
+    default_factory.clear()
+
+    def body():
+        LightClock(color=RED, symbol="\\tau")
+        LightClock(color=BLUE, symbol="t")
+        return {"factory_hits": default_factory.hits}
+
+    return body
+
+
+# Per-frame updater cost with many clocks on screen
+
+
+def update_analog_clocks(count):
+    def setup():
+        clocks = VGroup(*(AnalogClock() for _ in range(count)))
+
+        def run():
+            times, dt = _frames()
+            for t in times:
+                for clock in clocks:
+                    clock.accumulated_time.set_value(t)
+                clocks.update(dt)
+
+        return run
+
+    return setup
+
+
+def update_light_clocks(count, **options):
+    def setup():
+        clocks = VGroup(*(LightClock(**options) for _ in range(count)))
+
+        def run():
+            times, dt = _frames()
+            for t in times:
+                for clock in clocks:
+                    clock.proper_time.set_value(t)
+                clocks.update(dt)
+
+        return run
+
+    return setup
+
+
+for count in (1, 10):
+    register(f"updaters/analog_clock[{count}]", update_analog_clocks(count))
+    register(f"updaters/light_clock[{count}]", update_light_clocks(count))
+    register(
+        f"updaters/light_clock[{count},analytic]",
+        update_light_clocks(count, analytic=True),
+    )
+
+
+# Photon trace growth over a long run
+
+
+def trace_growth(seconds, **options):
+    def setup():
+        dot = Dot()
+        trace = PhotonTrace(dot.get_center, **options)
+
+        def run():
+            frames = int(seconds * FRAME_RATE)
+            times, dt = _frames(frames)
+            for t in times:
+                # Bounce up and down while drifting right, like a moving clock
+                height = 2 * (1 - abs(1 - (t / 0.5) % 2))
+                dot.move_to(RIGHT * 0.5 * t + UP * height)
+                trace.update(dt)
+                trace.get_length()
+            return {"points": len(trace.points)}
+
+        return run
+
+    return setup
+
+
+for seconds in (10, 60):
+    register(f"trace/growth[{seconds}s]", trace_growth(seconds), repeat=3)
+    register(
+        f"trace/growth[{seconds}s,decimate]",
+        trace_growth(seconds, decimate=True),
+        repeat=3,
+    )
+    register(
+        f"trace/growth[{seconds}s,window=2s]",
+        trace_growth(seconds, time_window=2, decimate=True),
+        repeat=3,
+    )
@@ -0,0 +1,128 @@
+import fnmatch
+import importlib
+import json
+import logging
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+# Modules that register benchmarks when imported
+BENCHMARK_MODULES = (
+    "manim_sandbox.benchmarks.components",
+    "manim_sandbox.benchmarks.scenes",
+)
+
+
+@dataclass
+class Benchmark:
+    """A named measurement.
+
+    `setup` prepares the state to measure and returns the function that is
+    timed. That function may return a dict of extra metrics to record, such
+    as point counts.
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], dict | None]]
+    repeat: int = 5
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def register(name: str, setup, repeat: int = 5):
+    BENCHMARKS[name] = Benchmark(name, setup, repeat)
+
+
+def benchmark(name: str, repeat: int = 5):
+    """Register the decorated setup function as a benchmark."""
+
+    def decorator(setup):
+        register(name, setup, repeat)
+        return setup
+
+    return decorator
+
+
+def load_benchmarks() -> dict[str, Benchmark]:
+    for module in BENCHMARK_MODULES:
+        importlib.import_module(module)
+    return BENCHMARKS
+
+
+def run_benchmark(bench: Benchmark, repeat: int | None = None) -> dict:
+    runs = []
+    metrics = {}
+    for _ in range(repeat or bench.repeat):
+        body = bench.setup()
+        start = time.perf_counter()
+        metrics = body() or {}
+        runs.append(time.perf_counter() - start)
+    return {
+        "seconds": min(runs),
+        "median": statistics.median(runs),
+        "runs": runs,
+        "metrics": metrics,
+    }
+
+
+def run_benchmarks(pattern: str | None = None, repeat: int | None = None) -> dict:
+    """Run the benchmarks whose names match the glob `pattern`."""
+    results = {}
+    for name, bench in load_benchmarks().items():
+        if pattern and not fnmatch.fnmatch(name, pattern):
+            continue
+        log.info(f"Running {name}...")
+        results[name] = run_benchmark(bench, repeat)
+        log.info(f"  {results[name]['seconds'] * 1000:10.2f} ms")
+    try:
+        manim_version = version("manim")
+    except PackageNotFoundError:
+        manim_version = None
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "manim": manim_version,
+        "machine": platform.node(),
+        "results": results,
+    }
+
+
+def save_results(results: dict, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2))
+
+
+def load_results(path: Path) -> dict:
+    return json.loads(path.read_text())
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[dict]:
+    """Compare best times against a baseline run.
+
+    Returns one row per benchmark present in both runs, with `regressed` set
+    when it got slower by more than `threshold` (0.1 is 10%).
+    """
+    rows = []
+    for name, result in results["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = result["seconds"] / base["seconds"] if base["seconds"] else 1.0
+        rows.append(
+            {
+                "name": name,
+                "baseline": base["seconds"],
+                "current": result["seconds"],
+                "ratio": ratio,
+                "regressed": ratio > 1 + threshold,
+            }
+        )
+    return rows
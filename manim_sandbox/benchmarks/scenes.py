@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import numpy as np
+from manim import config, tempconfig
+
+from manim_sandbox.benchmarks.runner import register
+from manim_sandbox.mmake.engine import load_scene_class
+from manim_sandbox.mmake.scenes import SceneJob
+
+# Shared media dir, so TeX compiled by one run is reused by the next
+MEDIA_DIR = Path("output/bench/media")
+
+# Scenes rendered end to end, at low quality and without writing frames
+SCENES = [
+    SceneJob(
+        "spacetime/relativity",
+        Path("manim_sandbox/spacetime/relativity/time_dilation.py"),
+        "TimeDilationDemo",
+    ),
+    SceneJob(
+        "spacetime/relativity",
+        Path("manim_sandbox/spacetime/relativity/inertial_ref_frames.py"),
+        "InertialReferenceFrames",
+    ),
+]
+
+
+HEADLESS_CONFIG = {
+    "quality": "low_quality",
+    "write_to_movie": False,
+    "save_last_frame": False,
+    "disable_caching": True,
+    "progress_bar": "none",
+    "verbosity": "WARNING",
+    "media_dir": str(MEDIA_DIR),
+}
+
+
+# Zoomed scene rendered with each way of filling its zoomed display
+ZOOMED_SCENE = SCENES[1]
+
+# Scene options of each zoom benchmark; the first one is the reference image
+ZOOM_VARIANTS = {
+    "render": {"zoom_mode": "render"},
+    "crop-nearest-1x": {
+        "zoom_mode": "crop",
+        "zoom_supersample": 1,
+        "zoom_resampling": "nearest",
+    },
+    "crop-bilinear-1x": {
+        "zoom_mode": "crop",
+        "zoom_supersample": 1,
+        "zoom_resampling": "bilinear",
+    },
+    "crop-bilinear-2x": {
+        "zoom_mode": "crop",
+        "zoom_supersample": 2,
+        "zoom_resampling": "bilinear",
+    },
+}
+
+
+def render_headless(scene: SceneJob, **options):
+    def setup():
+        scene_class = load_scene_class(scene)
+        # Run construct() once without rendering so LaTeX is not timed
+        with tempconfig({**HEADLESS_CONFIG, "dry_run": True}):
+            scene_class(**options).render()
+
+        def run():
+            with tempconfig(HEADLESS_CONFIG):
+                rendered = scene_class(**options)
+                rendered.render()
+                frames = round(rendered.renderer.time * config.frame_rate)
+            return {"plays": rendered.renderer.num_plays, "frames": frames}
+
+        return run
+
+    return setup
+
+
+def last_frame(scene_class: type, **options) -> np.ndarray:
+    with tempconfig(HEADLESS_CONFIG):
+        rendered = scene_class(**options)
+        rendered.render()
+        return np.asarray(rendered.renderer.camera.get_image(), dtype=np.float32)
+
+
+def render_zoomed(options: dict):
+    """Time one zoom mode and compare its last frame with the reference."""
+    render = render_headless(ZOOMED_SCENE, **options)
+
+    def setup():
+        run = render()
+        scene_class = load_scene_class(ZOOMED_SCENE)
+        reference = last_frame(scene_class, **next(iter(ZOOM_VARIANTS.values())))
+        error = np.abs(last_frame(scene_class, **options) - reference).mean()
+
+        def run_zoomed():
+            return {**run(), "mean_abs_error": round(float(error), 3)}
+
+        return run_zoomed
+
+    return setup
+
+
+for scene in SCENES:
+    register(f"render/{scene.name}", render_headless(scene), repeat=1)
+
+for variant, options in ZOOM_VARIANTS.items():
+    register(f"zoom/{variant}", render_zoomed(options), repeat=1)
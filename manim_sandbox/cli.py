@@ -1,12 +1,16 @@
 import logging
 from pathlib import Path
-import subprocess
 import click
-from importlib.metadata import version
+
+# Only option choices are imported up front. Commands import the build
+# tooling they need, so `--help` and `new` start quickly.
+from manim_sandbox.mmake.render import ENGINES, GIF_COLORS, QUALITY_NAMES
 
 # Constants
 SRC_DIR = Path("manim_sandbox")
 OUTPUT_DIR = Path("output")
+CONFIG_FILE = Path("config/manim.cfg")
+FORMATS = ["png", "gif", "mp4"]
 
 # Configure logging
 log = logging.getLogger(__name__)
@@ -15,47 +19,306 @@ logging.basicConfig(
     format='%(levelname)s: %(message)s'
 )
 
+def comma_separated(choices):
+    """An option callback that splits a comma separated list of `choices`."""
+
+    def parse(ctx, param, value):
+        if value is None:
+            return []
+        values = list(dict.fromkeys(part.strip() for part in value.split(",")))
+        unknown = [item for item in values if item not in choices]
+        if unknown:
+            raise click.BadParameter(
+                f"unknown value {', '.join(unknown)}; "
+                f"choose from {', '.join(choices)}"
+            )
+        return values
+
+    return parse
+
+
+def parse_size(ctx, param, value):
+    """Parse a byte size such as `512M` or `8G`."""
+    if value is None:
+        return None
+    units = {"K": 1024, "M": 1024**2, "G": 1024**3}
+    number, unit = value[:-1], value[-1].upper()
+    if unit not in units:
+        number, unit = value, ""
+    try:
+        return int(float(number) * units.get(unit, 1))
+    except ValueError:
+        raise click.BadParameter(f"'{value}' is not a size like 512M or 8G.")
+
+
 @click.group()
-@click.version_option(version=version("manim-sandbox"))
+# The version is only looked up when `--version` is used
+@click.version_option(package_name="manim-sandbox")
 def cli():
     """CLI for managing Manim projects."""
     pass
 
 
 @cli.command()
-@click.argument("project_name")
+@click.argument("selectors", nargs=-1, required=True)
 @click.option(
     "--format",
-    type=click.Choice(["png", "gif", "mp4"]),
+    "formats",
     default="gif",
-    help="Output format: 'png', 'gif', or 'mp4'.",
+    callback=comma_separated(FORMATS),
+    help="Output formats, comma separated: any of 'png', 'gif' and 'mp4'.",
 )
-def build(project_name, format):
-    """Build figures for a specific project."""
-    project_path = SRC_DIR / project_name
-    output_path = OUTPUT_DIR / project_name
+@click.option(
+    "--quality",
+    "qualities",
+    callback=comma_separated(list(QUALITY_NAMES)),
+    help=(
+        "Build a ladder of qualities, comma separated, e.g. 'l,m,k'. Each goes "
+        "to its own folder and lower qualities render first."
+    ),
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of scenes to render concurrently.",
+)
+@click.option(
+    "--memory-budget",
+    callback=parse_size,
+    help="Only start renders while their recorded peak memory fits, e.g. 8G.",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    help="Reuse outputs of scenes unchanged since the last build.",
+)
+@click.option(
+    "--changed",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Only rebuild scenes that are in or import this file. Repeatable.",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(ENGINES),
+    default="subprocess",
+    help=(
+        "Run manim once per scene, import it once and render in process, or "
+        "render in process and stream frames to the encoders."
+    ),
+)
+@click.option(
+    "--queue-size",
+    type=click.IntRange(min=1),
+    default=16,
+    help="Frames each encoder may fall behind with --engine stream.",
+)
+@click.option(
+    "--precompile-tex",
+    is_flag=True,
+    help="Compile the projects' TeX in parallel before rendering.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Write a timing report and flamegraph stacks for each scene.",
+)
+@click.option(
+    "--segments",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Render each movie as this many ranges of animations in parallel.",
+)
+@click.option(
+    "--gif-colors",
+    type=click.IntRange(min=2, max=GIF_COLORS),
+    default=GIF_COLORS,
+    help="Most colors in a GIF's palette, one of which is kept for transparency.",
+)
+@click.option(
+    "--gif-max-height",
+    type=click.IntRange(min=2),
+    help="Scale GIFs down to at most this many pixels tall.",
+)
+def build(
+    selectors,
+    formats,
+    qualities,
+    jobs,
+    memory_budget,
+    cache,
+    changed,
+    engine,
+    queue_size,
+    precompile_tex,
+    profile,
+    segments,
+    gif_colors,
+    gif_max_height,
+):
+    """Build figures for projects, files or single scenes.
 
-    if not project_path.exists():
-        log.error(f"Project '{project_name}' does not exist in {SRC_DIR}.")
-        return
+    Each selector is `project`, `project:file` or `project:file:SceneName`,
+    e.g. `spacetime/relativity:time_dilation:TimeDilationDemo`.
+    """
+    from manim_sandbox.mmake.build import build_scenes
+    from manim_sandbox.mmake.graph import ImportGraph
+    from manim_sandbox.mmake.render import RenderSettings
+    from manim_sandbox.mmake.runner import summarize
+    from manim_sandbox.mmake.scenes import select_scenes
+
+    scenes = []
+    for selector in selectors:
+        try:
+            matches = select_scenes(selector, SRC_DIR)
+        except ValueError as error:
+            raise click.BadParameter(str(error), param_hint="SELECTORS")
+        scenes.extend(scene for scene in matches if scene not in scenes)
+
+    graph = ImportGraph(SRC_DIR.parent)
+    if changed:
+        scenes = [
+            scene for scene in scenes if graph.affected_by(scene.file, changed)
+        ]
+        if not scenes:
+            log.info("No selected scenes depend on the changed files.")
+            return
+
+    if profile:
+        # Profiling hooks into manim, so scenes must render in process, and
+        # cached scenes would have nothing to report
+        if engine != "inprocess":
+            log.info("Profiling renders scenes with the inprocess engine.")
+        engine = "inprocess"
+        cache = False
+        segments = 1
+
+    if segments > 1 and formats == ["png"]:
+        log.info("Still images have no animations to split; ignoring --segments.")
+        segments = 1
+
+    results = build_scenes(
+        scenes,
+        [
+            RenderSettings.for_format(
+                name, gif_colors=gif_colors, gif_max_height=gif_max_height
+            )
+            for name in formats
+        ],
+        output_dir=OUTPUT_DIR,
+        graph=graph,
+        config_file=CONFIG_FILE,
+        jobs=jobs,
+        use_cache=cache,
+        force=scenes if changed else (),
+        engine=engine,
+        tex_prepass=precompile_tex,
+        profile=profile,
+        segments=segments,
+        queue_size=queue_size,
+        qualities=qualities,
+        memory_budget=memory_budget,
+    )
+    failures = summarize(results)
+    if failures:
+        raise click.ClickException(
+            f"{len(failures)} of {len(results)} scenes failed to render."
+        )
+
+    projects = dict.fromkeys(scene.project for scene in scenes)
+    outputs = ", ".join(str(OUTPUT_DIR / project) for project in projects)
+    log.info(f"Build complete! Outputs saved to {outputs}")
+
+
+@cli.command()
+@click.argument("selectors", nargs=-1, required=True)
+@click.option(
+    "--format",
+    type=click.Choice(FORMATS),
+    default="mp4",
+    help="Preview format: 'png', 'gif', or 'mp4'.",
+)
+@click.option(
+    "--quality",
+    type=click.Choice(list(QUALITY_NAMES)),
+    default="l",
+    help="Preview quality, as in manim's -q flag.",
+)
+def watch(selectors, format, quality):
+    """Re-render scenes whenever their sources change.
+
+    Takes the same selectors as `build`. Only scenes that are in or import a
+    changed file are rendered again.
+    """
+    from manim_sandbox.mmake.render import RenderSettings
+    from manim_sandbox.mmake.scenes import select_scenes
+    from manim_sandbox.mmake.watch import watch as watch_scenes
 
-    # Set quality and format arguments based on output format
-    if format == "png":
-        quality_args = ["-qk", "--save-png"]
-    elif format == "gif":
-        quality_args = ["-qm", "--format", "gif"]
-    else:  # mp4
-        quality_args = ["-qm", "--format", "mp4"]
+    for selector in selectors:
+        try:
+            select_scenes(selector, SRC_DIR)
+        except ValueError as error:
+            raise click.BadParameter(str(error), param_hint="SELECTORS")
+    settings = RenderSettings(format=format, quality=quality)
+    watch_scenes(selectors, SRC_DIR, OUTPUT_DIR, settings)
 
-    log.info(f"Building files for project: {project_name}...")
 
-    # Process each file in the project folder
-    for file_path in project_path.glob("*.py"):
-        log.info(f"Processing {file_path.name}...")
-        command = ["manim", str(file_path)] + quality_args
-        subprocess.run(command, check=True)
+@cli.command()
+@click.option("--filter", "pattern", help="Only run benchmarks matching this glob.")
+@click.option(
+    "--repeat",
+    type=click.IntRange(min=1),
+    help="Override the number of runs of each benchmark.",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=OUTPUT_DIR / "bench" / "latest.json",
+    show_default=True,
+    help="Where to save the results.",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Earlier results to compare against.",
+)
+@click.option(
+    "--threshold",
+    type=float,
+    default=0.1,
+    show_default=True,
+    help="Slowdown relative to the baseline that counts as a regression.",
+)
+def bench(pattern, repeat, output, baseline, threshold):
+    """Run the performance benchmarks."""
+    from manim_sandbox.benchmarks.runner import (
+        compare,
+        load_results,
+        run_benchmarks,
+        save_results,
+    )
+
+    results = run_benchmarks(pattern, repeat)
+    save_results(results, output)
+    log.info(f"Results saved to {output}")
+    if baseline is None:
+        return
 
-    log.info(f"Build complete! Outputs saved to {output_path}")
+    rows = compare(results, load_results(baseline), threshold)
+    for row in rows:
+        flag = "REGRESSED" if row["regressed"] else ""
+        log.info(
+            f"  {row['name']:<45} {row['baseline'] * 1000:10.2f} ms -> "
+            f"{row['current'] * 1000:10.2f} ms ({row['ratio']:.2f}x) {flag}"
+        )
+    regressions = [row for row in rows if row["regressed"]]
+    if regressions:
+        raise click.ClickException(
+            f"{len(regressions)} benchmarks regressed by more than "
+            f"{threshold:.0%} against {baseline}."
+        )
 
 
 @cli.command()
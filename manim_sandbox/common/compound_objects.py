@@ -31,34 +31,54 @@ class WallWithCrossHatching(VGroup):
         spacing: float = 0.3,
         hatch_length: float = 0.3,
         angle: float = PI / 4,
+        batch_hatches: bool = False,
         **kwargs,
     ):
         super().__init__(**kwargs)
         wall = Line(start=start, end=end, color=color)
-        hatch_lines = VGroup()
         wall_vector = np.array(end) - np.array(start)
         wall_length = np.linalg.norm(wall_vector)
         direction = wall_vector / wall_length
         num_hatches = int(wall_length / spacing)
-        for i in range(num_hatches + 1):
-            point = np.array(start) + direction * spacing * i
-            hatch_offset = np.array(
-                [
-                    hatch_length * np.cos(angle + PI / 2),
-                    hatch_length * np.sin(angle + PI / 2),
-                    0,
-                ]
-            )
-            hatch_lines.add(
-                Line(
-                    start=point,
-                    end=point + hatch_offset,
-                    stroke_width=1,
-                    color=color,
+        hatch_offset = np.array(
+            [
+                hatch_length * np.cos(angle + PI / 2),
+                hatch_length * np.sin(angle + PI / 2),
+                0,
+            ]
+        )
+        hatch_starts = np.array(start) + np.outer(
+            spacing * np.arange(num_hatches + 1), direction
+        )
+        if batch_hatches:
+            # All hatches as separate subpaths of one VMobject, so moving the
+            # wall transforms a single point array instead of N Lines
+            hatch_lines = VMobject(stroke_width=1, color=color)
+            hatch_lines.set_points(self.hatch_points(hatch_starts, hatch_offset))
+        else:
+            hatch_lines = VGroup(
+                *(
+                    Line(
+                        start=point,
+                        end=point + hatch_offset,
+                        stroke_width=1,
+                        color=color,
+                    )
+                    for point in hatch_starts
                 )
             )
         self.add(wall, hatch_lines)
 
+    @staticmethod
+    def hatch_points(hatch_starts, hatch_offset):
+        """Bezier points of straight hatches, laid out like Line's points."""
+        alphas = np.linspace(0, 1, 4)
+        points = (
+            hatch_starts[:, np.newaxis, :]
+            + alphas[np.newaxis, :, np.newaxis] * hatch_offset
+        )
+        return points.reshape(-1, 3)
+
 
 class TwoOpposingWalls(VGroup):
     def __init__(
@@ -69,6 +89,7 @@ class TwoOpposingWalls(VGroup):
         hatch_length: float,
         color: ManimColor = WHITE,
         angle: float = PI / 4,
+        batch_hatches: bool = False,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -79,7 +100,12 @@ class TwoOpposingWalls(VGroup):
         start1 = first_midpoint + half_wall
         end1 = first_midpoint - half_wall
         wall1 = WallWithCrossHatching(
-            start1, end1, color=color, hatch_length=hatch_length, angle=angle
+            start1,
+            end1,
+            color=color,
+            hatch_length=hatch_length,
+            angle=angle,
+            batch_hatches=batch_hatches,
         )
         start2 = second_midpoint + half_wall
         end2 = second_midpoint - half_wall
@@ -89,11 +115,15 @@ class TwoOpposingWalls(VGroup):
             color=color,
             hatch_length=hatch_length,
             angle=angle + PI,
+            batch_hatches=batch_hatches,
         )
         self.add(wall1, wall2)
 
 
 class AnalogClock(VGroup):
+    # Number of Bezier curves manim uses for each arc of an AnnularSector
+    ARC_COMPONENTS = 9
+
     def __init__(
         self,
         radius=0.5,
@@ -121,6 +151,7 @@ class AnalogClock(VGroup):
             color=YELLOW,
             fill_opacity=0.7,
         )
+        self._init_sector_template()
         # Use only one updater
         self.add_updater(self.update_progress_indicator)
 
@@ -133,27 +164,90 @@ class AnalogClock(VGroup):
                 0, num_decimal_places=decimal_places, color=WHITE, font_size=font_size
             ).move_to(self.face.get_center())
         # This updates the text to the current accumulated_time
-        self.value_display.add_updater(
-            lambda m: m.set_value(self.accumulated_time.get_value())
-        )
+        self.value_display.add_updater(self.update_value_display)
 
         # Add components to the AnalogClock
         self.add(self.face, self.progress_indicator, self.value_display)
 
+    def _init_sector_template(self):
+        # Precompute everything about the annular sector that does not depend
+        # on the angle, so each frame only evaluates a few sines and cosines.
+        # The layout matches AnnularSector.generate_points: inner arc, line to
+        # the outer arc, outer arc reversed, line back to the inner arc.
+        n = self.ARC_COMPONENTS
+        self._arc_fractions = np.linspace(0, 1, n)
+        self._line_alphas = np.linspace(0, 1, 4)[:, np.newaxis]
+        self._unit_anchors = np.zeros((n, 3))
+        self._unit_tangents = np.zeros((n, 3))
+        self._unit_arc = np.zeros((4 * (n - 1), 3))
+        self._sector_points = np.zeros((8 * (n - 1) + 8, 3))
+
+    def _unit_arc_points(self, angle):
+        # Same construction as Arc._set_pre_positioned_points, in place
+        n = self.ARC_COMPONENTS
+        angles = PI / 2 + angle * self._arc_fractions
+        anchors = self._unit_anchors
+        tangents = self._unit_tangents
+        arc = self._unit_arc
+        np.cos(angles, out=anchors[:, 0])
+        np.sin(angles, out=anchors[:, 1])
+        np.negative(anchors[:, 1], out=tangents[:, 0])
+        tangents[:, 1] = anchors[:, 0]
+        factor = 4 / 3 * np.tan(angle / (n - 1) / 4)
+        arc[0::4] = anchors[:-1]
+        np.multiply(tangents[:-1], factor, out=arc[1::4])
+        arc[1::4] += anchors[:-1]
+        np.multiply(tangents[1:], -factor, out=arc[2::4])
+        arc[2::4] += anchors[1:]
+        arc[3::4] = anchors[1:]
+        return arc
+
+    def update_value_display(self, display):
+        display.set_value(self.accumulated_time.get_value())
+
     def tick_progress(self):
         return self.accumulated_time.get_value() % 1
 
+    def set_time(self, value, center=None):
+        """Show `value` on the clock without going through its updaters.
+
+        Pass the clock's `center` when the caller already knows it, to save
+        measuring the whole clock.
+        """
+        self.accumulated_time.set_value(value)
+        self.value_display.set_value(value)
+        self.draw_progress(self.get_center() if center is None else center)
+
     def update_progress_indicator(self, clock, dt):
+        self.draw_progress(self.get_center())
+
+    def draw_progress(self, center):
         # Update the sector geometry based on tick progress, ticking clockwise
         angle = -self.tick_progress() * TAU  # negative for clockwise
-        new_sector = Sector(
-            outer_radius=self.radius,
-            inner_radius=self.radius * 0.9,
-            angle=angle,
-            start_angle=PI / 2,
-            color=YELLOW,
-            fill_opacity=0.7,
+        inner_radius = self.radius * 0.9
+        outer_radius = self.radius
+        arc = self._unit_arc_points(angle)
+        arc_length = len(arc)
+        points = self._sector_points
+        inner = points[:arc_length]
+        outer = points[arc_length + 4 : 2 * arc_length + 4]
+        np.multiply(arc, inner_radius, out=inner)
+        np.multiply(arc[::-1], outer_radius, out=outer)
+        points[arc_length : arc_length + 4] = interpolate(
+            inner[-1], outer[0], self._line_alphas
         )
-        new_sector.move_arc_center_to(self.get_center())
-        # Replace the old sector geometry
-        self.progress_indicator.become(new_sector)
+        points[-4:] = interpolate(outer[-1], inner[0], self._line_alphas)
+        if angle == 0:
+            # A zero-angle arc has no center to find, so manim pins the
+            # degenerate sector's first point to the clock center instead
+            points += center - points[0]
+        else:
+            points += center
+
+        # Write into the existing sector instead of building a new one
+        sector = self.progress_indicator
+        if sector.points.shape == points.shape:
+            sector.points[:] = points
+        else:
+            # Animations like Create can leave the sector partially drawn
+            sector.set_points(points)
@@ -0,0 +1,65 @@
+from collections import OrderedDict
+
+from manim import *
+from manim.utils.color import ManimColor
+
+
+def freeze(value):
+    """Turn constructor arguments into a hashable cache key."""
+    if isinstance(value, np.ndarray):
+        return ("ndarray", value.shape, tuple(value.ravel().tolist()))
+    if isinstance(value, ManimColor):
+        return ("color", value.to_hex(with_alpha=True))
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((k, freeze(v)) for k, v in value.items())))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(freeze(v) for v in value))
+    try:
+        hash(value)
+    except TypeError:
+        return ("repr", repr(value))
+    return value
+
+
+class MobjectFactory:
+    """LRU cache of prototype mobjects keyed on their constructor arguments.
+
+    `create` builds a mobject once per distinct set of arguments and hands
+    out deep copies of that prototype afterwards, which skips rebuilding
+    grids, hatching and TeX for repeated components. Mobjects built this way
+    must not capture `self` in lambda updaters, since copies would keep
+    updating the prototype; use bound methods instead.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._prototypes = OrderedDict()
+
+    def create(self, cls, *args, **kwargs):
+        key = (cls, freeze(args), freeze(kwargs))
+        prototype = self._prototypes.get(key)
+        if prototype is None:
+            self.misses += 1
+            prototype = cls(*args, **kwargs)
+            self._prototypes[key] = prototype
+            if len(self._prototypes) > self.maxsize:
+                self._prototypes.popitem(last=False)
+        else:
+            self.hits += 1
+            self._prototypes.move_to_end(key)
+        return prototype.copy()
+
+    def clear(self):
+        self._prototypes.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+default_factory = MobjectFactory()
+
+
+def cached(cls, *args, **kwargs):
+    """Create `cls(*args, **kwargs)` through the shared factory."""
+    return default_factory.create(cls, *args, **kwargs)
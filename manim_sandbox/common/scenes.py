@@ -0,0 +1,310 @@
+import functools
+import hashlib
+
+from manim import *
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.utils.family import extract_mobject_family_members
+from manim.utils.iterables import list_update
+
+# Arrays that determine how a mobject is drawn, besides its points
+STYLE_ARRAYS = (
+    "fill_rgbas",
+    "stroke_rgbas",
+    "background_stroke_rgbas",
+    "pixel_array",
+)
+
+# Scalars that determine how a mobject is drawn
+STYLE_VALUES = ("stroke_width", "background_stroke_width", "sheen_factor", "z_index")
+
+
+class BackgroundCache:
+    """Keeps the rasterized static mobjects of a scene across `play` calls.
+
+    manim draws the mobjects that do not move during an animation once into
+    a background image, but it does so again for every `play`. This cache
+    keys that image on a fingerprint of the static mobjects and the camera,
+    so it is only drawn again when one of them changes.
+    """
+
+    def __init__(self, renderer: CairoRenderer):
+        self.renderer = renderer
+        self.key = None
+        self.image = None
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, mobjects: list[Mobject]) -> str:
+        camera = self.renderer.camera
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(
+            repr(
+                (
+                    camera.pixel_width,
+                    camera.pixel_height,
+                    camera.frame_width,
+                    camera.frame_height,
+                    tuple(camera.frame_center),
+                    str(camera.background_color),
+                )
+            ).encode()
+        )
+        for mobject in mobjects:
+            digest.update(id(mobject).to_bytes(8, "little"))
+            digest.update(np.ascontiguousarray(mobject.points).data)
+            for name in STYLE_ARRAYS:
+                array = getattr(mobject, name, None)
+                if array is not None:
+                    digest.update(np.ascontiguousarray(array).data)
+            digest.update(
+                repr([getattr(mobject, name, None) for name in STYLE_VALUES]).encode()
+            )
+        return digest.hexdigest()
+
+    def save_static_frame_data(self, scene: Scene, static_mobjects: list[Mobject]):
+        """Stand-in for `CairoRenderer.save_static_frame_data`."""
+        renderer = self.renderer
+        renderer.static_image = None
+        if not static_mobjects:
+            return None
+        key = self.fingerprint(static_mobjects)
+        if key == self.key:
+            self.hits += 1
+        else:
+            self.misses += 1
+            # The static mobjects are already a flat list of family members
+            renderer.update_frame(
+                scene, mobjects=static_mobjects, include_submobjects=False
+            )
+            self.key = key
+            self.image = renderer.get_frame()
+        renderer.static_image = self.image
+        return self.image
+
+
+class SandboxScene(Scene):
+    """A scene that draws its still mobjects once and reuses them.
+
+    Before each animation, every mobject that is drawn before the first one
+    that moves (is animated, has an updater itself or through a parent, or
+    is in the foreground) is static. Unlike manim's own split, a group with
+    one moving part does not make its other parts move. The static mobjects
+    are rasterized into a background that is kept across animations until
+    one of them or the camera changes, and only the moving mobjects are
+    drawn on top of it for each frame.
+
+    Set `cache_background = False` on a subclass to turn this off.
+    """
+
+    cache_background = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.background_cache = None
+        if self.cache_background and isinstance(self.renderer, CairoRenderer):
+            self.background_cache = BackgroundCache(self.renderer)
+            self.renderer.save_static_frame_data = (
+                self.background_cache.save_static_frame_data
+            )
+
+    def get_moving_roots(self, animations) -> list[Mobject]:
+        """The mobjects that move, with their families, during `animations`."""
+        roots = [
+            animation.mobject
+            for animation in animations
+            if animation.mobject is not None
+        ]
+        roots += [
+            mobject for mobject in self.get_mobject_family_members() if mobject.updaters
+        ]
+        return roots + self.foreground_mobjects
+
+    def get_moving_and_static_mobjects(self, animations):
+        if not self.cache_background:
+            return super().get_moving_and_static_mobjects(animations)
+        use_z_index = self.renderer.camera.use_z_index
+        drawn = extract_mobject_family_members(
+            list_update(self.mobjects, self.foreground_mobjects),
+            use_z_index=use_z_index,
+            only_those_with_points=True,
+        )
+        moving = {
+            id(mobject)
+            for mobject in extract_mobject_family_members(
+                self.get_moving_roots(animations), use_z_index=use_z_index
+            )
+        }
+        first_moving = next(
+            (index for index, mobject in enumerate(drawn) if id(mobject) in moving),
+            len(drawn),
+        )
+        return drawn[first_moving:], drawn[:first_moving]
+
+
+# How zoomed displays are filled
+ZOOM_MODES = ("render", "crop")
+
+# How the crop for a zoomed display is resampled
+RESAMPLING = ("nearest", "bilinear")
+
+
+def downsample(pixel_array: np.ndarray, factor: int) -> np.ndarray:
+    """Shrink an image by an integer factor, averaging each block of pixels."""
+    if factor == 1:
+        return pixel_array
+    height, width, depth = pixel_array.shape
+    blocks = pixel_array.reshape(
+        height // factor, factor, width // factor, factor, depth
+    )
+    return np.rint(blocks.mean(axis=(1, 3), dtype=np.float32)).astype(np.uint8)
+
+
+def resample(
+    pixel_array: np.ndarray,
+    xs: np.ndarray,
+    ys: np.ndarray,
+    method: str,
+    fill: np.ndarray,
+) -> np.ndarray:
+    """Sample an image at pixel coordinates `xs` (columns) and `ys` (rows).
+
+    Samples outside the image take the `fill` color.
+    """
+    height, width = pixel_array.shape[:2]
+    if method == "nearest":
+        columns = np.clip(np.rint(xs).astype(int), 0, width - 1)
+        rows = np.clip(np.rint(ys).astype(int), 0, height - 1)
+        result = pixel_array[rows[:, None], columns[None, :]]
+    else:
+        x0 = np.clip(np.floor(xs).astype(int), 0, width - 2)
+        y0 = np.clip(np.floor(ys).astype(int), 0, height - 2)
+        wx = np.clip(xs - x0, 0, 1)[None, :, None]
+        wy = np.clip(ys - y0, 0, 1)[:, None, None]
+        top = pixel_array[y0[:, None], x0[None, :]].astype(np.float32)
+        top_right = pixel_array[y0[:, None], x0[None, :] + 1]
+        bottom = pixel_array[y0[:, None] + 1, x0[None, :]].astype(np.float32)
+        bottom_right = pixel_array[y0[:, None] + 1, x0[None, :] + 1]
+        top += (top_right - top) * wx
+        bottom += (bottom_right - bottom) * wx
+        result = np.rint(top + (bottom - top) * wy).astype(np.uint8)
+    outside = (xs < -0.5) | (xs > width - 0.5)
+    result[:, outside] = fill
+    result[(ys < -0.5) | (ys > height - 0.5)] = fill
+    return result
+
+
+class CroppingMultiCamera(MultiCamera):
+    """A MultiCamera that fills zoomed displays by cropping its own frame.
+
+    The scene is drawn once. Each zoomed display then shows the part of that
+    frame under its camera's frame, resampled to the display's size, before
+    the displays themselves are drawn. Drawing at `supersample` times the
+    output resolution keeps the magnified crop sharp; frames are shrunk back
+    with `downsample` on their way out.
+    """
+
+    def __init__(self, supersample: int = 1, resampling: str = "bilinear", **kwargs):
+        self.supersample = supersample
+        self.resampling = resampling
+        kwargs.setdefault("pixel_height", config.pixel_height * supersample)
+        kwargs.setdefault("pixel_width", config.pixel_width * supersample)
+        super().__init__(**kwargs)
+
+    def capture_mobjects(self, mobjects, **kwargs):
+        displays = {
+            id(mobject)
+            for display in self.image_mobjects_from_cameras
+            for mobject in display.get_family()
+        }
+        scene = [mobject for mobject in mobjects if id(mobject) not in displays]
+        on_top = [mobject for mobject in mobjects if id(mobject) in displays]
+        # Skip MultiCamera, which renders the scene again for every display
+        Camera.capture_mobjects(self, scene, **kwargs)
+        if on_top:
+            for display in self.image_mobjects_from_cameras:
+                display.camera.pixel_array = self.crop(display)
+            Camera.capture_mobjects(self, on_top, **kwargs)
+
+    def crop(self, display: ImageMobjectFromCamera) -> np.ndarray:
+        """The part of the current frame under the display camera's frame."""
+        pixel_height, pixel_width = self.pixel_array.shape[:2]
+        left = self.frame_center[0] - self.frame_width / 2
+        top = self.frame_center[1] + self.frame_height / 2
+        frame = display.camera.frame
+        x_scale = pixel_width / self.frame_width
+        y_scale = pixel_height / self.frame_height
+        x0 = (frame.get_left()[0] - left) * x_scale
+        x1 = (frame.get_right()[0] - left) * x_scale
+        y0 = (top - frame.get_top()[1]) * y_scale
+        y1 = (top - frame.get_bottom()[1]) * y_scale
+        # The display covers this many pixels of the frame it is drawn into
+        width = max(1, round(display.width * x_scale))
+        height = max(1, round(display.height * y_scale))
+        xs = x0 + (np.arange(width) + 0.5) * (x1 - x0) / width - 0.5
+        ys = y0 + (np.arange(height) + 0.5) * (y1 - y0) / height - 0.5
+        fill = self.background[0, 0]
+        return resample(self.pixel_array, xs, ys, self.resampling, fill)
+
+    def downsample(self, pixel_array: np.ndarray) -> np.ndarray:
+        return downsample(pixel_array, self.supersample)
+
+    def get_image(self, pixel_array=None):
+        if pixel_array is None:
+            pixel_array = self.pixel_array
+        return super().get_image(self.downsample(pixel_array))
+
+
+class SandboxZoomedScene(SandboxScene, ZoomedScene):
+    """A ZoomedScene that can fill its zoomed display by cropping.
+
+    With `zoom_mode = "render"` the scene is rendered again for the zoomed
+    display, as in ZoomedScene. With `"crop"` it is rendered once at
+    `zoom_supersample` times the output resolution, and the zoomed display is
+    cropped from that frame with `zoom_resampling` ("nearest" or "bilinear").
+    A supersample of 1 is fastest but shows magnified pixels. Mobjects drawn
+    above the zoomed display still end up under it when cropping.
+
+    The static background cache of SandboxScene is only used when cropping,
+    since the zoomed camera only renders the moving mobjects.
+    """
+
+    zoom_mode = "render"
+    zoom_supersample = 2
+    zoom_resampling = "bilinear"
+
+    def __init__(
+        self,
+        zoom_mode: str | None = None,
+        zoom_supersample: int | None = None,
+        zoom_resampling: str | None = None,
+        **kwargs,
+    ):
+        self.zoom_mode = zoom_mode or self.zoom_mode
+        self.zoom_supersample = zoom_supersample or self.zoom_supersample
+        self.zoom_resampling = zoom_resampling or self.zoom_resampling
+        if self.zoom_mode not in ZOOM_MODES:
+            raise ValueError(f"zoom_mode must be one of {ZOOM_MODES}")
+        if self.zoom_resampling not in RESAMPLING:
+            raise ValueError(f"zoom_resampling must be one of {RESAMPLING}")
+        self.cache_background = self.cache_background and self.zoom_mode == "crop"
+        if self.zoom_mode == "crop":
+            kwargs["camera_class"] = functools.partial(
+                CroppingMultiCamera,
+                supersample=self.zoom_supersample,
+                resampling=self.zoom_resampling,
+            )
+        super().__init__(**kwargs)
+        if self.zoom_mode == "crop" and self.zoom_supersample > 1:
+            add_frame = self.renderer.add_frame
+
+            def add_downsampled_frame(frame, num_frames=1):
+                add_frame(self.renderer.camera.downsample(frame), num_frames)
+
+            self.renderer.add_frame = add_downsampled_frame
+
+    def get_moving_roots(self, animations):
+        roots = super().get_moving_roots(animations)
+        # The zoomed display is cropped from whatever is drawn under it
+        if self.zoom_activated:
+            roots.append(self.zoomed_display)
+        return roots
@@ -0,0 +1 @@
+"""Build tooling behind the `mmake` CLI."""
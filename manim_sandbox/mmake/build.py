@@ -0,0 +1,353 @@
+import logging
+import os
+from collections import Counter
+from collections.abc import Collection, Sequence
+from contextlib import ExitStack
+from dataclasses import replace
+from pathlib import Path
+
+from manim_sandbox.mmake.cache import BuildCache
+from manim_sandbox.mmake.encode import QUALITY_ORDER, master_settings, render_formats
+from manim_sandbox.mmake.engine import WarmWorkerPool, render_in_process
+from manim_sandbox.mmake.graph import ImportGraph
+from manim_sandbox.mmake.history import RenderHistory
+from manim_sandbox.mmake.manifest import BuildManifest
+from manim_sandbox.mmake.render import (
+    QUALITY_NAMES,
+    RenderResult,
+    RenderSettings,
+    render_scene,
+)
+from manim_sandbox.mmake.runner import run_jobs
+from manim_sandbox.mmake.scenes import SceneJob
+from manim_sandbox.mmake.segments import render_segmented
+from manim_sandbox.mmake.tex import collect_tex_calls, precompile_tex
+
+log = logging.getLogger(__name__)
+
+
+def build_scenes(
+    scenes: Sequence[SceneJob],
+    formats: Sequence[RenderSettings],
+    output_dir: Path,
+    graph: ImportGraph,
+    config_file: Path,
+    jobs: int = 1,
+    use_cache: bool = True,
+    force: Collection[SceneJob] = (),
+    engine: str = "subprocess",
+    tex_prepass: bool = False,
+    profile: bool = False,
+    segments: int = 1,
+    queue_size: int = 16,
+    qualities: Sequence[str] = (),
+    memory_budget: int | None = None,
+) -> list[RenderResult]:
+    """Render the stale scenes and reuse cached outputs for the rest.
+
+    A scene is stale unless all of `formats` are cached. With more than one
+    format, it is rendered once and every format is encoded from that render.
+    Stills are scaled from the render's last frame, which it saves losslessly.
+    GIFs are always encoded from a rendered movie, so they can hold repeated
+    frames.
+    Each project keeps its own cache next to its outputs in
+    `output_dir/<project>`. Scenes in `force` are rendered regardless.
+
+    The `subprocess` engine runs the manim CLI once per scene. The
+    `inprocess` engine imports manim once and renders through its Python
+    API, in this process or in a pool of `jobs` warm workers. The `stream`
+    engine renders in process too, but streams frames to an encoder per
+    format through queues of `queue_size` frames instead of writing partial
+    movies, and logs how often the renderer waited on each encoder.
+
+    With `tex_prepass`, the TeX in the stale scenes and the modules they
+    import is compiled up front across `jobs` processes, once per project.
+    It goes into the project's TeX cache in `output_dir/<project>`, which
+    every render of that project shares, in every tier of a ladder.
+
+    `profile` instruments in-process renders and writes a report per scene
+    to `output_dir/<project>/profile`.
+
+    With `segments` above one, each movie is rendered as that many ranges of
+    animations in parallel warm workers, which are then stitched together.
+
+    Every build updates `output_dir/<project>/manifest.json`, an index of
+    the scenes' renders and artifacts.
+
+    `qualities` builds a ladder: every scene is rendered at each quality,
+    into `output_dir/<project>/<quality name>`. All renders of a lower
+    quality are started before any of the next, so previews of every scene
+    are ready first.
+
+    Within a tier, the longest renders start first, using the render times
+    kept in `output_dir/.mmake-history.json`. Scenes without history are
+    estimated from their number of animation calls. With `memory_budget`,
+    renders only start while the peak memory recorded for the renders in
+    flight stays within that many bytes. Smaller renders of the same tier
+    can only start ahead of one that does not fit a few times.
+    """
+    caches = {
+        project: BuildCache(output_dir / project, graph, config_file)
+        for project in dict.fromkeys(scene.project for scene in scenes)
+    }
+    manifests = {project: BuildManifest(output_dir / project) for project in caches}
+    if qualities:
+        tiers = {
+            QUALITY_NAMES[quality]: [
+                replace(settings, quality=quality) for settings in formats
+            ]
+            for quality in sorted(qualities, key=QUALITY_ORDER.index)
+        }
+    else:
+        tiers = {"": list(formats)}
+
+    def tier_dir(tier: str, scene: SceneJob) -> Path:
+        return output_dir / scene.project / tier
+
+    def shared_dir(scene: SceneJob) -> Path | None:
+        # Tiers share the project's TeX and text caches
+        return output_dir / scene.project if qualities else None
+
+    targets = [(tier, scene) for tier in tiers for scene in scenes]
+    keys = {
+        (tier, scene, settings): caches[scene.project].key(scene, settings, tier)
+        for tier, scene in targets
+        for settings in tiers[tier]
+    }
+
+    results = {}
+    if use_cache:
+        for tier, scene in targets:
+            if scene in force:
+                continue
+            outputs = [
+                caches[scene.project].lookup(keys[tier, scene, settings])
+                for settings in tiers[tier]
+            ]
+            if all(artifacts is not None for artifacts in outputs):
+                for settings, artifacts in zip(tiers[tier], outputs):
+                    manifests[scene.project].record(
+                        scene,
+                        settings,
+                        keys[tier, scene, settings],
+                        artifacts,
+                        tier=tier,
+                    )
+                results[tier, scene] = RenderResult(
+                    scene,
+                    0,
+                    0.0,
+                    artifacts=[path for artifacts in outputs for path in artifacts],
+                    cached=True,
+                    tier=tier,
+                )
+    stale = [target for target in targets if target not in results]
+
+    history = RenderHistory(output_dir)
+    qualities_of = {tier: master_settings(tiers[tier]).quality for tier in tiers}
+    estimates = {
+        (tier, scene): history.estimate(scene, qualities_of[tier])
+        for tier, scene in stale
+    }
+    tier_order = list(tiers)
+    stale.sort(key=lambda target: (tier_order.index(target[0]), -estimates[target]))
+    memory = {
+        (tier, scene): history.peak_memory(scene, qualities_of[tier]) or 0
+        for tier, scene in stale
+    }
+    if memory_budget is not None and stale and not any(memory.values()):
+        log.warning(
+            "No peak memory is recorded for the scenes to render, so the memory "
+            "budget cannot limit them. Memory is measured by the subprocess "
+            "engine, and the budget applies from the next build."
+        )
+
+    if tex_prepass:
+        for project in dict.fromkeys(scene.project for _, scene in stale):
+            sources = dict.fromkeys(
+                source
+                for _, scene in stale
+                if scene.project == project
+                for source in [scene.file, *sorted(graph.dependencies(scene.file))]
+            )
+            precompile_tex(collect_tex_calls(sources), output_dir / project, jobs)
+
+    log.info(
+        f"Rendering {len(stale)} of {len(targets)} scenes "
+        f"with {jobs} worker(s), longest first "
+        f"(~{sum(estimates.values()):.0f}s of render time)..."
+    )
+
+    # Share the cores between the renders in flight
+    gif_workers = max(1, (os.cpu_count() or 1) // jobs)
+
+    with ExitStack() as stack:
+        if segments > 1 and stale:
+            pool = stack.enter_context(WarmWorkerPool(max(jobs, segments)))
+
+            def render_with(
+                scene: SceneJob, settings: RenderSettings, media_dir: Path
+            ) -> RenderResult:
+                return render_segmented(
+                    scene,
+                    settings,
+                    media_dir,
+                    segments,
+                    pool,
+                    gif_workers,
+                    shared_dir=shared_dir(scene),
+                )
+
+        elif engine != "subprocess" and jobs > 1 and stale:
+            pool = stack.enter_context(WarmWorkerPool(jobs))
+
+            def render_with(
+                scene: SceneJob, settings: RenderSettings, media_dir: Path
+            ) -> RenderResult:
+                return pool.render(
+                    scene,
+                    settings,
+                    media_dir,
+                    profile=profile,
+                    shared_dir=shared_dir(scene),
+                )
+
+        elif engine != "subprocess":
+
+            def render_with(
+                scene: SceneJob, settings: RenderSettings, media_dir: Path
+            ) -> RenderResult:
+                return render_in_process(
+                    scene,
+                    settings,
+                    media_dir,
+                    profile=profile,
+                    shared_dir=shared_dir(scene),
+                )
+
+        else:
+
+            def render_with(
+                scene: SceneJob, settings: RenderSettings, media_dir: Path
+            ) -> RenderResult:
+                # Keep manim's own progress output when rendering one at a time
+                return render_scene(
+                    scene,
+                    settings,
+                    media_dir,
+                    capture_output=jobs > 1,
+                    shared_dir=shared_dir(scene),
+                )
+
+        if engine == "stream" and segments == 1:
+            # Imports manim, so only load it for streaming builds
+            from manim_sandbox.mmake.stream import render_streaming
+
+            def render_target(
+                scene: SceneJob, outputs: Sequence[RenderSettings], media_dir: Path
+            ) -> RenderResult:
+                if jobs > 1:
+                    return pool.run(
+                        render_streaming,
+                        scene,
+                        outputs,
+                        media_dir,
+                        queue_size=queue_size,
+                        quiet=True,
+                        gif_workers=gif_workers,
+                        shared_dir=shared_dir(scene),
+                    )
+                return render_streaming(
+                    scene,
+                    outputs,
+                    media_dir,
+                    queue_size=queue_size,
+                    gif_workers=gif_workers,
+                    shared_dir=shared_dir(scene),
+                )
+
+        else:
+
+            def render_target(
+                scene: SceneJob, outputs: Sequence[RenderSettings], media_dir: Path
+            ) -> RenderResult:
+                # GIFs are encoded from a movie, so they can hold repeated frames
+                if len(outputs) == 1 and outputs[0].format != "gif":
+                    return render_with(scene, outputs[0], media_dir)
+                return render_formats(
+                    scene,
+                    outputs,
+                    media_dir,
+                    lambda scene, settings: render_with(scene, settings, media_dir),
+                    gif_workers,
+                )
+
+        def render(target: tuple[str, SceneJob]) -> RenderResult:
+            tier, scene = target
+            result = render_target(scene, tiers[tier], tier_dir(tier, scene))
+            result.tier = tier
+            return result
+
+        remaining = Counter(tier for tier, _ in stale)
+
+        def finished(result: RenderResult):
+            tier, scene = result.tier, result.scene
+            remaining[tier] -= 1
+            if tier and not remaining[tier]:
+                log.info(f"All {tier} renders are done.")
+            if not result.ok:
+                return
+            if engine == "stream":
+                for line in result.output.splitlines():
+                    log.info(f"{result.label} {line}")
+            frames = []
+            for settings in tiers[tier]:
+                artifacts = [
+                    path
+                    for path in result.artifacts
+                    if path.suffix == f".{settings.format}"
+                ]
+                caches[scene.project].record(
+                    keys[tier, scene, settings], scene, settings, artifacts, tier
+                )
+                entry = manifests[scene.project].record(
+                    scene,
+                    settings,
+                    keys[tier, scene, settings],
+                    artifacts,
+                    render_seconds=result.duration,
+                    tier=tier,
+                )
+                frames += [
+                    record["frames"]
+                    for record in entry["artifacts"]
+                    if record["frames"] is not None
+                ]
+            history.record(
+                scene,
+                qualities_of[tier],
+                result.duration,
+                frames=max(frames, default=None),
+                peak_memory=result.peak_memory,
+            )
+
+        for result in run_jobs(
+            stale,
+            render,
+            jobs=jobs,
+            on_result=finished,
+            memory=memory,
+            memory_budget=memory_budget,
+            failure=lambda target, output, duration: RenderResult(
+                target[1], 1, duration, output, tier=target[0]
+            ),
+            # Previews of every scene come before any render of the next tier
+            group=lambda target: target[0],
+        ):
+            results[result.tier, result.scene] = result
+    for project, cache in caches.items():
+        cache.save()
+        manifests[project].save()
+    history.save()
+
+    return [results[target] for target in targets]
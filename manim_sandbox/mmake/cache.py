@@ -0,0 +1,91 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+from manim_sandbox.mmake.graph import ImportGraph
+from manim_sandbox.mmake.render import RenderSettings
+from manim_sandbox.mmake.scenes import SceneJob
+
+log = logging.getLogger(__name__)
+
+class BuildCache:
+    """Content-addressed record of rendered scenes and their artifacts.
+
+    Entries are keyed on a hash of everything that affects a render, so an
+    unchanged scene can reuse the artifacts of its previous build.
+    """
+
+    FILENAME = ".mmake-cache.json"
+
+    def __init__(self, output_path: Path, graph: ImportGraph, config_file: Path):
+        self.output_path = output_path
+        self.graph = graph
+        self.config_file = config_file
+        self.path = output_path / self.FILENAME
+        self.entries = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text())
+            except json.JSONDecodeError:
+                log.warning(f"Ignoring corrupt build cache at {self.path}.")
+
+    def key(self, scene: SceneJob, settings: RenderSettings, tier: str = "") -> str:
+        """The cache key of `scene` rendered with `settings` into `tier`.
+
+        Renders of a quality ladder live in a folder per tier, so they never
+        share artifacts with a plain build at the same quality.
+        """
+        digest = hashlib.sha256()
+        digest.update(scene.id.encode())
+        if tier:
+            digest.update(f"tier={tier}".encode())
+        digest.update(" ".join(settings.cli_args() + settings.encoder_args()).encode())
+        sources = {scene.file} | self.graph.dependencies(scene.file)
+        for path in sorted(sources):
+            digest.update(str(path).encode())
+            digest.update(path.read_bytes())
+        if self.config_file.exists():
+            digest.update(self.config_file.read_bytes())
+        return digest.hexdigest()
+
+    def lookup(self, key: str) -> list[Path] | None:
+        """Return the cached artifacts for a key, if they all still exist."""
+        entry = self.entries.get(key)
+        if entry is None or not entry["artifacts"]:
+            return None
+        artifacts = [self.output_path / path for path in entry["artifacts"]]
+        if not all(path.exists() for path in artifacts):
+            return None
+        return artifacts
+
+    def record(
+        self,
+        key: str,
+        scene: SceneJob,
+        settings: RenderSettings,
+        artifacts: list[Path],
+        tier: str = "",
+    ):
+        # Only the latest build of a scene with given settings is kept
+        stale = [
+            other
+            for other, entry in self.entries.items()
+            if entry["scene"] == scene.id
+            and entry.get("tier", "") == tier
+            and entry["settings"] == settings.cli_args() + settings.encoder_args()
+        ]
+        for other in stale:
+            del self.entries[other]
+        self.entries[key] = {
+            "scene": scene.id,
+            "tier": tier,
+            "settings": settings.cli_args() + settings.encoder_args(),
+            "artifacts": [
+                str(path.relative_to(self.output_path)) for path in artifacts
+            ],
+        }
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.entries, indent=2, sort_keys=True))
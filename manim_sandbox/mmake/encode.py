@@ -0,0 +1,293 @@
+import logging
+import subprocess
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+
+from manim_sandbox.mmake.render import (
+    QUALITY_DIRS,
+    QUALITY_NAMES,
+    RenderResult,
+    RenderSettings,
+)
+from manim_sandbox.mmake.scenes import SceneJob
+
+log = logging.getLogger(__name__)
+
+# Quality flags from lowest to highest
+QUALITY_ORDER = list(QUALITY_NAMES)
+
+
+def ffmpeg_command(args: list[str]) -> list[str]:
+    return ["ffmpeg", "-y", "-loglevel", "error", *args]
+
+
+def run_ffmpeg(args: list[str]) -> tuple[int, str]:
+    command = ffmpeg_command(args)
+    log.debug(f"Running: {' '.join(command)}")
+    try:
+        completed = subprocess.run(
+            command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+        )
+    except OSError as error:
+        return 127, str(error)
+    return completed.returncode, completed.stdout
+
+
+def quality_size(quality: str) -> tuple[int, int]:
+    """Pixel height and frame rate of a manim quality flag."""
+    height, rate = QUALITY_DIRS[quality].split("p")
+    return int(height), int(rate)
+
+
+def scaled_size(width: int, height: int, target_height: int) -> tuple[int, int]:
+    """Size of a `width` by `height` frame scaled like ffmpeg's `scale=-2:h`."""
+    return 2 * round(width * target_height / height / 2), target_height
+
+
+def master_settings(formats: Sequence[RenderSettings]) -> RenderSettings:
+    """The movie every format in `formats` can be encoded from."""
+    quality = max((settings.quality for settings in formats), key=QUALITY_ORDER.index)
+    return RenderSettings("mp4", quality)
+
+
+def output_path(scene: SceneJob, settings: RenderSettings, media_dir: Path) -> Path:
+    """Where manim would write `scene` rendered with `settings`."""
+    if settings.format == "png":
+        return media_dir / "images" / scene.file.stem / f"{scene.name}.png"
+    return (
+        media_dir
+        / "videos"
+        / scene.file.stem
+        / QUALITY_DIRS[settings.quality]
+        / f"{scene.name}.{settings.format}"
+    )
+
+
+def output_args(settings: RenderSettings, output: Path) -> list[str]:
+    """ffmpeg output options that write one input video to `output`."""
+    height, rate = quality_size(settings.quality)
+    scale = f"scale=-2:{height}:flags=lanczos"
+    if settings.format == "png":
+        # Keep overwriting the image, so the last frame is left
+        return ["-vf", scale, "-update", "1", str(output)]
+    return [
+        "-vf",
+        f"fps={rate},{scale}",
+        "-c:v",
+        "libx264",
+        "-pix_fmt",
+        "yuv420p",
+        str(output),
+    ]
+
+
+def encode_args(movie: Path, settings: RenderSettings, output: Path) -> list[str]:
+    """ffmpeg arguments that encode `movie` to `output` with `settings`."""
+    return ["-i", str(movie), *output_args(settings, output)]
+
+
+def video_size(path: Path) -> tuple[int, int] | None:
+    """Pixel width and height of a video, or None if ffprobe cannot tell."""
+    command = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "stream=width,height",
+        "-of",
+        "csv=p=0",
+        str(path),
+    ]
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True)
+        width, height = map(int, completed.stdout.strip().split(","))
+    except (OSError, ValueError):
+        return None
+    return width, height
+
+
+def gif_size(width: int, height: int, settings: RenderSettings) -> tuple[int, int]:
+    """Pixel size of a GIF with `settings` made from `width` by `height` frames."""
+    target_height, _ = quality_size(settings.quality)
+    if settings.gif_max_height is not None:
+        target_height = min(target_height, settings.gif_max_height)
+    return scaled_size(width, height, target_height)
+
+
+def encode_gif(
+    movie: Path, settings: RenderSettings, output: Path, workers: int = 1
+) -> tuple[int, str]:
+    """Encode `movie` to a GIF that holds repeated frames.
+
+    ffmpeg decodes the movie at the GIF's size and frame rate, and runs of
+    identical frames are written once by `GifWriter`, with up to `workers`
+    processes.
+    """
+    # numpy and Pillow come with manim, so only load them to encode a GIF
+    import numpy as np
+
+    from manim_sandbox.mmake.frames import FrameRuns
+    from manim_sandbox.mmake.gif import GifWriter
+
+    size = video_size(movie)
+    if size is None:
+        return 1, f"Could not read the size of {movie}."
+    _, rate = quality_size(settings.quality)
+    width, height = gif_size(*size, settings)
+    command = ffmpeg_command(
+        [
+            "-i",
+            str(movie),
+            "-vf",
+            f"fps={rate},scale={width}:{height}:flags=lanczos",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "rgb24",
+            "-",
+        ]
+    )
+    log.debug(f"Running: {' '.join(command)}")
+    try:
+        process = subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+    except OSError as error:
+        return 127, str(error)
+    writer = GifWriter(
+        output, (width, height), rate, colors=settings.gif_colors, workers=workers
+    )
+    runs = FrameRuns()
+    frame_size = width * height * 3
+    while len(data := process.stdout.read(frame_size)) == frame_size:
+        frame = np.frombuffer(data, np.uint8).reshape(height, width, 3)
+        if (run := runs.add(frame)) is not None:
+            writer.write(*run)
+    if (run := runs.flush()) is not None:
+        writer.write(*run)
+    errors = process.stderr.read().decode(errors="replace")
+    if process.wait():
+        writer.discard()
+        return process.returncode, errors
+    writer.close()
+    return 0, errors
+
+
+def encode_still(
+    frame: Path, settings: RenderSettings, output: Path
+) -> tuple[int, str]:
+    """Write a still with `settings` from `frame`, a lossless last frame.
+
+    The frame is scaled to the height of the still's quality if it differs,
+    e.g. when the render was at a higher quality or supersampled.
+    """
+    # Pillow comes with manim, so only load it to scale a still
+    from PIL import Image
+
+    height, _ = quality_size(settings.quality)
+    try:
+        with Image.open(frame) as image:
+            if image.height == height and frame == output:
+                return 0, ""
+            if image.height != height:
+                size = scaled_size(image.width, image.height, height)
+                image = image.resize(size, Image.Resampling.LANCZOS)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            image.save(output)
+    except OSError as error:
+        return 1, f"Could not write {output} from {frame}: {error}"
+    return 0, ""
+
+
+def encode(
+    movie: Path,
+    scene: SceneJob,
+    settings: RenderSettings,
+    media_dir: Path,
+    gif_workers: int = 1,
+) -> tuple[int, str, Path]:
+    """Encode one output of `scene` from an already rendered movie.
+
+    GIFs are encoded with up to `gif_workers` processes.
+    """
+    output = output_path(scene, settings, media_dir)
+    if settings.format == "png":
+        # A movie's last frame has lost color detail to compression
+        return 1, "Stills are saved from a render, not taken from a movie.", output
+    if output == movie:
+        return 0, "", output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if settings.format == "gif":
+        returncode, message = encode_gif(movie, settings, output, gif_workers)
+    else:
+        returncode, message = run_ffmpeg(encode_args(movie, settings, output))
+    return returncode, message, output
+
+
+def render_formats(
+    scene: SceneJob,
+    formats: Sequence[RenderSettings],
+    media_dir: Path,
+    render: Callable[[SceneJob, RenderSettings], RenderResult],
+    gif_workers: int = 1,
+) -> RenderResult:
+    """Render `scene` once and encode each of `formats` from it in parallel.
+
+    The scene is rendered to a movie at the highest quality requested with
+    `render`. Movies and GIFs are scaled and resampled from it. GIFs show
+    each run of identical frames as a single frame with a longer delay, and
+    are encoded with up to `gif_workers` processes.
+
+    A still is scaled from the last frame the render saves losslessly, since
+    the movie's own last frame is lossy. A still above the quality of every
+    movie and GIF raises the movie's quality to its own.
+    """
+    movie_formats = [settings for settings in formats if settings.format != "png"]
+    stills = [settings for settings in formats if settings.format == "png"]
+    if not movie_formats:
+        return render(scene, stills[0])
+    result = render(scene, replace(master_settings(formats), last_frame=bool(stills)))
+    if not result.ok:
+        return result
+    movies = [path for path in result.artifacts if path.suffix == ".mp4"]
+    frames = [path for path in result.artifacts if path.suffix == ".png"]
+    missing = "movie" if not movies else "last frame" if stills and not frames else ""
+    if missing:
+        return RenderResult(
+            scene,
+            1,
+            result.duration,
+            f"The render wrote no {missing}.",
+            peak_memory=result.peak_memory,
+        )
+    movie = movies[0]
+
+    def encode_format(settings: RenderSettings) -> tuple[int, str, Path]:
+        if settings.format == "png":
+            output = output_path(scene, settings, media_dir)
+            return *encode_still(frames[0], settings, output), output
+        return encode(movie, scene, settings, media_dir, gif_workers)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(formats)) as pool:
+        outcomes = list(pool.map(encode_format, formats))
+    duration = result.duration + time.perf_counter() - start
+
+    failures = [message for returncode, message, _ in outcomes if returncode]
+    if failures:
+        return RenderResult(
+            scene, 1, duration, "\n".join(failures), peak_memory=result.peak_memory
+        )
+    return RenderResult(
+        scene,
+        0,
+        duration,
+        result.output,
+        [output for *_, output in outcomes],
+        peak_memory=result.peak_memory,
+    )
@@ -0,0 +1,198 @@
+import importlib.util
+import json
+import logging
+import multiprocessing
+import sys
+import time
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from manim_sandbox.mmake.encode import output_path
+from manim_sandbox.mmake.graph import module_name
+from manim_sandbox.mmake.profile import SceneProfiler
+from manim_sandbox.mmake.render import (
+    RenderResult,
+    RenderSettings,
+    find_artifacts,
+    shared_dirs,
+)
+from manim_sandbox.mmake.scenes import SceneJob
+
+log = logging.getLogger(__name__)
+
+# Tooling modules that stay loaded between renders
+TOOLING_MODULES = ("manim_sandbox.mmake", "manim_sandbox.cli")
+
+
+def forget_sandbox_modules():
+    """Drop imported sandbox sources so the next render sees any edits."""
+    for name in list(sys.modules):
+        if name.split(".")[0] == "manim_sandbox" and not name.startswith(
+            TOOLING_MODULES
+        ):
+            del sys.modules[name]
+
+
+def load_scene_class(scene: SceneJob, root: Path = Path(".")):
+    """Import a scene's module from its file and return the scene class."""
+    forget_sandbox_modules()
+    name = module_name(scene.file, root)
+    spec = importlib.util.spec_from_file_location(name, scene.file)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return getattr(module, scene.name)
+
+
+def render_in_process(
+    scene: SceneJob,
+    settings: RenderSettings,
+    media_dir: Path,
+    quiet: bool = False,
+    profile: bool = False,
+    overrides: dict | None = None,
+    shared_dir: Path | None = None,
+) -> RenderResult:
+    """Render one scene with manim's Python API in the current process.
+
+    With `profile`, the render is instrumented and its report is written to
+    `media_dir/profile`. `overrides` are applied on top of the settings'
+    config. With `settings.last_frame`, the frame the scene ends on is saved
+    where manim would put a still of it. With `shared_dir`, TeX and text are
+    cached there instead of in `media_dir`.
+    """
+    from manim import tempconfig
+
+    options = settings.config(media_dir)
+    # Output folders are named after the input file, as with the manim CLI
+    options["input_file"] = str(scene.file)
+    if quiet:
+        options.update(progress_bar="none", verbosity="WARNING")
+    if shared_dir is not None:
+        options.update(shared_dirs(shared_dir))
+    options.update(overrides or {})
+
+    started_at = time.time()
+    start = time.perf_counter()
+    try:
+        scene_class = load_scene_class(scene)
+        with tempconfig(options):
+            if profile:
+                with SceneProfiler() as profiler:
+                    instance = scene_class()
+                    instance.render()
+                profiler.write(media_dir / "profile", scene)
+            else:
+                instance = scene_class()
+                instance.render()
+            if settings.last_frame:
+                still = RenderSettings("png", settings.quality)
+                save_last_frame(instance, output_path(scene, still, media_dir))
+    except Exception:
+        return RenderResult(
+            scene, 1, time.perf_counter() - start, traceback.format_exc()
+        )
+    duration = time.perf_counter() - start
+    return RenderResult(
+        scene, 0, duration, artifacts=find_artifacts(scene, media_dir, started_at)
+    )
+
+
+def save_last_frame(instance, path: Path):
+    """Save the frame a rendered scene ends on as a PNG, as manim's `-s` does."""
+    from PIL import Image
+
+    renderer = instance.renderer
+    renderer.static_image = None
+    renderer.update_frame(instance, ignore_skipping=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(renderer.get_frame()).save(path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Render one scene in process, from `render_scene`'s subprocesses.
+
+    Takes the scene's project, file and name, the media folder, the settings
+    as JSON and optionally the shared folder for TeX and text.
+    """
+    project, file, name, media_dir, settings, *shared_dir = argv or sys.argv[1:]
+    result = render_in_process(
+        SceneJob(project, Path(file), name),
+        RenderSettings(**json.loads(settings)),
+        Path(media_dir),
+        shared_dir=Path(shared_dir[0]) if shared_dir else None,
+    )
+    print(result.output, end="")
+    return result.returncode
+
+
+def _warm_up():
+    # Pay for the manim import once per worker instead of once per scene
+    import manim  # noqa: F401
+
+
+class WarmWorkerPool:
+    """Long-lived worker processes that render scene jobs off a queue.
+
+    Each worker imports manim when it starts and then renders scenes in
+    process, so a build pays interpreter startup and the manim import once
+    per worker rather than once per scene.
+    """
+
+    def __init__(self, workers: int):
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_up,
+        )
+        self.broken = False
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Run `fn(*args, **kwargs)` in a warm worker."""
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def run(self, fn, scene: SceneJob, *args, **kwargs) -> RenderResult:
+        """Render `scene` with `fn(scene, *args, **kwargs)` in a warm worker."""
+        start = time.perf_counter()
+        future = self.submit(fn, scene, *args, **kwargs)
+        try:
+            return future.result()
+        except BrokenProcessPool as error:
+            self.broken = True
+            return RenderResult(
+                scene, 1, time.perf_counter() - start, f"Worker crashed: {error}"
+            )
+
+    def render(
+        self,
+        scene: SceneJob,
+        settings: RenderSettings,
+        media_dir: Path,
+        quiet: bool = True,
+        profile: bool = False,
+        shared_dir: Path | None = None,
+    ) -> RenderResult:
+        return self.run(
+            render_in_process,
+            scene,
+            settings,
+            media_dir,
+            quiet=quiet,
+            profile=profile,
+            shared_dir=shared_dir,
+        )
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
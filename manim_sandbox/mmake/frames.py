@@ -0,0 +1,58 @@
+import numpy as np
+
+# Rows compared before two frames are compared in full
+SAMPLE_ROWS = 16
+
+
+def same_frame(a: np.ndarray, b: np.ndarray) -> bool:
+    """Whether two frames are identical.
+
+    A few evenly spaced rows are compared first, which tells most changed
+    frames apart without reading all of them.
+    """
+    if a is b:
+        return True
+    if a.shape != b.shape:
+        return False
+    rows = np.linspace(0, a.shape[0] - 1, min(SAMPLE_ROWS, a.shape[0]), dtype=int)
+    return np.array_equal(a[rows], b[rows]) and np.array_equal(a, b)
+
+
+class FrameRuns:
+    """Merges consecutive identical frames into runs of `(frame, count)`.
+
+    The last run is held back until a different frame arrives or `flush` is
+    called, so it can keep growing.
+    """
+
+    def __init__(self):
+        self.frame = None
+        self.count = 0
+        self.frames = 0
+        self.duplicates = 0
+
+    def add(self, frame: np.ndarray, count: int = 1) -> tuple[np.ndarray, int] | None:
+        """Add `frame`, shown for `count` frames.
+
+        Returns the run it ended, if any.
+        """
+        self.frames += count
+        if self.frame is not None and same_frame(self.frame, frame):
+            self.count += count
+            self.duplicates += count
+            return None
+        run = self.flush()
+        self.frame = frame
+        self.count = count
+        # manim repeats a still frame itself, e.g. for a wait without updaters
+        self.duplicates += count - 1
+        return run
+
+    def flush(self) -> tuple[np.ndarray, int] | None:
+        """The held run, if any, which is then cleared."""
+        if self.frame is None:
+            return None
+        run = (self.frame, self.count)
+        self.frame = None
+        self.count = 0
+        return run
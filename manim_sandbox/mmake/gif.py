@@ -0,0 +1,247 @@
+import io
+import math
+import multiprocessing
+import os
+import struct
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# GIF delays are in hundredths of a second
+CENTISECONDS = 100
+
+# Loop forever
+LOOP_EXTENSION = b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00"
+
+# Leave each frame in place under the next one
+DISPOSE_NONE = 1 << 2
+
+# Frames quantized and compressed per task of the encoding pool
+FRAMES_PER_CHUNK = 32
+
+# Chunks below which starting a pool costs more than it saves
+MIN_POOL_CHUNKS = 4
+
+# Frames and pixels the palette is sampled from
+PALETTE_FRAMES = 32
+PALETTE_PIXELS = 4_000_000
+
+
+def skip_blocks(data: bytes, position: int) -> int:
+    """Position after the data sub-blocks starting at `position`."""
+    while data[position]:
+        position += data[position] + 1
+    return position + 1
+
+
+def lzw_data(indices: np.ndarray) -> bytes:
+    """The LZW compressed image data of a 2D array of palette indices.
+
+    Pillow writes it as a single frame GIF, which is taken apart here so the
+    frame can go into a GIF of our own.
+    """
+    buffer = io.BytesIO()
+    # An L image is written with its values as palette indices
+    Image.fromarray(indices).save(buffer, "GIF", optimize=False, interlace=False)
+    data = buffer.getvalue()
+    flags = data[10]
+    position = 13
+    if flags & 0x80:
+        position += 3 * 2 ** ((flags & 7) + 1)
+    while data[position] == 0x21:
+        position = skip_blocks(data, position + 2)
+    flags = data[position + 9]
+    position += 10
+    if flags & 0x80:
+        position += 3 * 2 ** ((flags & 7) + 1)
+    # The LZW minimum code size, then the image's sub-blocks
+    return data[position : skip_blocks(data, position + 1)]
+
+
+def sample_palette(frames: np.ndarray, colors: int) -> bytes:
+    """An RGB palette of up to `colors` colors for all of `frames`.
+
+    It is built from evenly spaced frames, subsampled to about
+    `PALETTE_PIXELS` pixels between them.
+    """
+    picks = np.linspace(0, len(frames) - 1, min(PALETTE_FRAMES, len(frames)), dtype=int)
+    pixels = len(picks) * frames.shape[1] * frames.shape[2]
+    step = max(1, math.isqrt(pixels // PALETTE_PIXELS))
+    mosaic = np.concatenate([frames[index, ::step, ::step] for index in picks])
+    image = Image.fromarray(mosaic).quantize(colors, method=Image.Quantize.FASTOCTREE)
+    used = int(np.asarray(image).max()) + 1
+    return bytes(image.getpalette()[: 3 * used])
+
+
+def encode_chunk(
+    spool: str,
+    shape: tuple[int, ...],
+    palette: bytes,
+    start: int,
+    delays: list[int],
+) -> bytes:
+    """Quantize and compress frames `start` onwards of a frame spool.
+
+    Each frame is mapped onto `palette` and compared with the one before it.
+    Only the bounding box of the pixels that changed is written, with the
+    unchanged pixels in it transparent. Returns the GIF blocks of the frames.
+    """
+    frames = np.memmap(spool, np.uint8, "r", shape=shape)
+    colors = len(palette) // 3
+    # Pad the palette with its first color, so indices past it map back to it
+    mapping = Image.new("P", (1, 1))
+    mapping.putpalette(palette + palette[:3] * (256 - colors))
+    lookup = np.arange(256, dtype=np.uint8)
+    lookup[colors:] = 0
+    # The first index after the palette's colors marks unchanged pixels
+    transparent = colors
+
+    def indices(frame: np.ndarray) -> np.ndarray:
+        image = Image.fromarray(frame).quantize(
+            palette=mapping, dither=Image.Dither.NONE
+        )
+        return lookup[np.asarray(image)]
+
+    previous = indices(frames[start - 1]) if start else None
+    blocks = io.BytesIO()
+    for index, delay in enumerate(delays, start):
+        current = indices(frames[index])
+        flags = DISPOSE_NONE
+        top = left = 0
+        region = current
+        if previous is not None:
+            flags |= 1
+            changed = current != previous
+            rows = np.flatnonzero(changed.any(axis=1))
+            columns = np.flatnonzero(changed.any(axis=0))
+            if rows.size:
+                top, left = rows[0], columns[0]
+                box = np.s_[top : rows[-1] + 1, left : columns[-1] + 1]
+                region = np.where(changed[box], current[box], transparent)
+            else:
+                region = np.full((1, 1), transparent)
+        region = region.astype(np.uint8)
+        height, width = region.shape
+        blocks.write(
+            struct.pack("<BBBBHBB", 0x21, 0xF9, 4, flags, delay, transparent, 0)
+        )
+        blocks.write(struct.pack("<BHHHHB", 0x2C, left, top, width, height, 0))
+        blocks.write(lzw_data(region))
+        previous = current
+    return blocks.getvalue()
+
+
+class GifWriter:
+    """Writes a looping GIF from a stream of frames.
+
+    Frames come in at `source_rate` and are sampled at `rate` like ffmpeg's
+    `fps` filter, so frames that fall between two output frames are dropped.
+    A frame shown for several frames is kept once with a longer delay.
+    Delays are rounded to hundredths of a second against the running total,
+    so rounding errors do not add up.
+
+    Frames are spooled to a file next to the output and encoded on `close`.
+    All frames share one palette of up to `colors` colors, sampled from the
+    spool. Chunks of frames are then quantized and compressed, in a pool of
+    up to `workers` processes if there are enough of them. After the first
+    frame, each one only holds the pixels that changed, so still parts of
+    the figure cost next to nothing.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        size: tuple[int, int],
+        rate: float,
+        source_rate: float | None = None,
+        colors: int = 256,
+        workers: int = 1,
+    ):
+        self.path = path
+        self.size = size
+        self.rate = rate
+        self.source_rate = source_rate or rate
+        # One index is kept for transparency
+        self.colors = min(colors, 256) - 1
+        self.workers = workers
+        self.source_frames = 0
+        self.ticks = 0
+        self.delay = 0
+        self.delays = []
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.spool = tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f".{path.stem}-", suffix=".rgb", delete=False
+        )
+
+    def write(self, frame: np.ndarray, count: int = 1):
+        """Append an RGB or RGBA `frame`, shown for `count` source frames."""
+        self.source_frames += count
+        # Output frames up to the end of this one, rounded against float error
+        ticks = math.ceil(round(self.source_frames * self.rate / self.source_rate, 6))
+        if ticks == self.ticks:
+            return
+        self.ticks = ticks
+        end = round(ticks * CENTISECONDS / self.rate)
+        delay = max(1, end - self.delay)
+        self.delay += delay
+
+        image = Image.fromarray(np.ascontiguousarray(frame[..., :3]))
+        if image.size != self.size:
+            image = image.resize(self.size, Image.Resampling.LANCZOS)
+        self.spool.write(image.tobytes())
+        self.delays.append(delay)
+
+    def close(self):
+        """Encode the spooled frames and write the GIF."""
+        self.spool.close()
+        try:
+            self.encode()
+        finally:
+            os.unlink(self.spool.name)
+
+    def discard(self):
+        """Drop the spooled frames without writing anything."""
+        self.spool.close()
+        os.unlink(self.spool.name)
+
+    def encode(self):
+        width, height = self.size
+        shape = (len(self.delays), height, width, 3)
+        palette = b"\0\0\0"
+        if self.delays:
+            frames = np.memmap(self.spool.name, np.uint8, "r", shape=shape)
+            palette = sample_palette(frames, self.colors)
+            del frames
+        chunks = [
+            (
+                self.spool.name,
+                shape,
+                palette,
+                start,
+                self.delays[start : start + FRAMES_PER_CHUNK],
+            )
+            for start in range(0, len(self.delays), FRAMES_PER_CHUNK)
+        ]
+        workers = min(self.workers, len(chunks))
+        if workers > 1 and len(chunks) >= MIN_POOL_CHUNKS:
+            with ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                blocks = list(pool.map(encode_chunk, *zip(*chunks)))
+        else:
+            blocks = [encode_chunk(*chunk) for chunk in chunks]
+
+        # Room for the palette and the transparent index
+        bits = max(0, (len(palette) // 3).bit_length() - 1)
+        table = palette.ljust(3 * 2 ** (bits + 1), b"\0")
+        with self.path.open("wb") as file:
+            file.write(b"GIF89a")
+            file.write(struct.pack("<HHBBB", width, height, 0xF0 | bits, 0, 0))
+            file.write(table)
+            file.write(LOOP_EXTENSION)
+            for block in blocks:
+                file.write(block)
+            file.write(b";")
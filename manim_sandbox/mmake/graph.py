@@ -0,0 +1,98 @@
+import ast
+from collections.abc import Iterable
+from pathlib import Path
+
+# Only imports of this package are tracked; manim and friends are external
+PACKAGE = "manim_sandbox"
+
+
+def module_path(module: str, root: Path) -> Path | None:
+    """Resolve a dotted module name to its source file under `root`."""
+    base = root.joinpath(*module.split("."))
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def module_name(path: Path, root: Path) -> str:
+    parts = list(path.relative_to(root).with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def resolve_import(node: ast.ImportFrom, path: Path, root: Path) -> str | None:
+    """The absolute module name a `from ... import` in `path` refers to."""
+    if not node.level:
+        return node.module
+    # Relative import: climb from the importing module's package
+    package = module_name(path, root).split(".")
+    if path.name != "__init__.py":
+        package.pop()
+    if node.level > 1:
+        package = package[: -(node.level - 1)]
+    return ".".join(package + ([node.module] if node.module else []))
+
+
+class ImportGraph:
+    """Import graph of the `manim_sandbox` modules under `root`.
+
+    Edges are found by parsing sources, so building the graph never imports
+    manim. Parsed files are memoized for the lifetime of the graph.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._imports = {}
+        self._dependencies = {}
+
+    def imports(self, path: Path) -> set[Path]:
+        """Source files of the package modules `path` imports directly."""
+        if path in self._imports:
+            return self._imports[path]
+        tree = ast.parse(path.read_text(), filename=str(path))
+        modules = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                module = resolve_import(node, path, self.root)
+                if module:
+                    modules.add(module)
+                    # `from package import module` imports a module too
+                    modules.update(
+                        f"{module}.{alias.name}" for alias in node.names
+                    )
+        found = set()
+        for module in modules:
+            parts = module.split(".")
+            if parts[0] != PACKAGE:
+                continue
+            # Importing a module runs every parent package's __init__ too
+            for end in range(1, len(parts) + 1):
+                source = module_path(".".join(parts[:end]), self.root)
+                if source is not None and source != path:
+                    found.add(source)
+        self._imports[path] = found
+        return found
+
+    def dependencies(self, path: Path) -> set[Path]:
+        """Every package source file `path` imports, transitively."""
+        if path in self._dependencies:
+            return self._dependencies[path]
+        seen = set()
+        stack = [path]
+        while stack:
+            for dependency in self.imports(stack.pop()):
+                if dependency not in seen and dependency != path:
+                    seen.add(dependency)
+                    stack.append(dependency)
+        self._dependencies[path] = seen
+        return seen
+
+    def affected_by(self, path: Path, changed: Iterable[Path]) -> bool:
+        """Whether `path` is one of `changed` or transitively imports one."""
+        changed = {Path(p).resolve() for p in changed}
+        sources = {path} | self.dependencies(path)
+        return any(source.resolve() in changed for source in sources)
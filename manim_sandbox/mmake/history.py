@@ -0,0 +1,107 @@
+import ast
+import json
+import logging
+from pathlib import Path
+
+from manim_sandbox.mmake.scenes import SceneJob
+
+log = logging.getLogger(__name__)
+
+# Render seconds per `play`/`wait` call assumed before any scene has history
+SECONDS_PER_CALL = 1.0
+
+# Weight of the latest render in the running averages
+SMOOTHING = 0.5
+
+
+def count_animation_calls(path: Path, class_name: str) -> int:
+    """Count the `self.play` and `self.wait` calls in a class's source."""
+    tree = ast.parse(path.read_text(), filename=str(path))
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == class_name:
+            return sum(
+                isinstance(call, ast.Call)
+                and isinstance(call.func, ast.Attribute)
+                and call.func.attr in ("play", "wait")
+                and isinstance(call.func.value, ast.Name)
+                and call.func.value.id == "self"
+                for call in ast.walk(node)
+            )
+    return 0
+
+
+class RenderHistory:
+    """Render time, frame count and peak memory of past renders.
+
+    Used to schedule builds. Scenes without history get a static estimate
+    from their number of animation calls, calibrated on the scenes that have
+    one.
+    """
+
+    FILENAME = ".mmake-history.json"
+
+    def __init__(self, output_dir: Path):
+        self.path = output_dir / self.FILENAME
+        self.entries = {}
+        self._calls = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text())
+            except json.JSONDecodeError:
+                log.warning(f"Ignoring corrupt render history at {self.path}.")
+
+    @staticmethod
+    def key(scene: SceneJob, quality: str) -> str:
+        return f"{scene.id}@{quality}"
+
+    def calls(self, scene: SceneJob) -> int:
+        if scene not in self._calls:
+            self._calls[scene] = count_animation_calls(scene.file, scene.name)
+        return self._calls[scene]
+
+    def record(
+        self,
+        scene: SceneJob,
+        quality: str,
+        seconds: float,
+        frames: int | None = None,
+        peak_memory: int | None = None,
+    ):
+        entry = self.entries.get(self.key(scene, quality))
+        if entry is not None:
+            seconds = SMOOTHING * seconds + (1 - SMOOTHING) * entry["seconds"]
+            frames = frames if frames is not None else entry["frames"]
+            if peak_memory is None:
+                peak_memory = entry["peak_memory"]
+        self.entries[self.key(scene, quality)] = {
+            "seconds": seconds,
+            "frames": frames,
+            "peak_memory": peak_memory,
+            "calls": self.calls(scene),
+        }
+
+    def seconds_per_call(self, quality: str) -> float:
+        """Average render seconds per animation call at `quality`."""
+        entries = [
+            entry for key, entry in self.entries.items() if key.endswith(f"@{quality}")
+        ]
+        calls = sum(entry["calls"] for entry in entries)
+        if not calls:
+            return SECONDS_PER_CALL
+        return sum(entry["seconds"] for entry in entries) / calls
+
+    def estimate(self, scene: SceneJob, quality: str) -> float:
+        """Expected render seconds of `scene` at `quality`."""
+        entry = self.entries.get(self.key(scene, quality))
+        if entry is not None:
+            return entry["seconds"]
+        # Every scene costs at least its setup, even without animations
+        return max(self.calls(scene), 1) * self.seconds_per_call(quality)
+
+    def peak_memory(self, scene: SceneJob, quality: str) -> int | None:
+        entry = self.entries.get(self.key(scene, quality))
+        return entry["peak_memory"] if entry is not None else None
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.entries, indent=2, sort_keys=True))
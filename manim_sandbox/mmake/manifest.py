@@ -0,0 +1,153 @@
+import json
+import logging
+import subprocess
+import time
+from pathlib import Path
+
+from manim_sandbox.mmake.render import RenderSettings
+from manim_sandbox.mmake.scenes import SceneJob
+
+log = logging.getLogger(__name__)
+
+
+def probe(path: Path) -> dict:
+    """Size, resolution, frame count and duration of a rendered file.
+
+    Everything but the size is None when ffprobe is unavailable or cannot
+    read the file.
+    """
+    info = {
+        "size": path.stat().st_size,
+        "width": None,
+        "height": None,
+        "frames": None,
+        "duration": None,
+    }
+    command = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-count_packets",
+        "-show_entries",
+        "stream=width,height,nb_read_packets:format=duration",
+        "-of",
+        "json",
+        str(path),
+    ]
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True)
+        probed = json.loads(completed.stdout)
+    except (OSError, json.JSONDecodeError):
+        return info
+    stream = (probed.get("streams") or [{}])[0]
+    frames = stream.get("nb_read_packets")
+    duration = probed.get("format", {}).get("duration")
+    info.update(
+        width=stream.get("width"),
+        height=stream.get("height"),
+        frames=int(frames) if frames is not None else None,
+        duration=float(duration) if duration not in (None, "N/A") else None,
+    )
+    return info
+
+
+class BuildManifest:
+    """Index of the scenes built into a project's output folder.
+
+    For each scene it records every render: the source hash it was built
+    from, its settings, how long it took and the files it produced. A reverse
+    index maps each artifact path back to its scene, so tools can go either
+    way without walking the output tree.
+    """
+
+    FILENAME = "manifest.json"
+
+    def __init__(self, output_path: Path):
+        self.output_path = output_path
+        self.path = output_path / self.FILENAME
+        self.scenes = {}
+        self.artifacts = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+                self.scenes = data["scenes"]
+                self.artifacts = data["artifacts"]
+            except (json.JSONDecodeError, KeyError):
+                log.warning(f"Ignoring corrupt build manifest at {self.path}.")
+
+    @staticmethod
+    def render_name(settings: RenderSettings, tier: str = "") -> str:
+        name = f"{settings.format}-{settings.quality}"
+        return f"{tier}/{name}" if tier else name
+
+    def scene(self, scene_id: str) -> dict | None:
+        """The manifest entry of a scene, with all of its renders."""
+        return self.scenes.get(scene_id)
+
+    def owner(self, path: Path) -> dict | None:
+        """The scene and render that produced an artifact.
+
+        `path` is relative to the output folder or includes it.
+        """
+        if self.output_path in path.parents:
+            path = path.relative_to(self.output_path)
+        return self.artifacts.get(path.as_posix())
+
+    def record(
+        self,
+        scene: SceneJob,
+        settings: RenderSettings,
+        source_hash: str,
+        artifacts: list[Path],
+        render_seconds: float | None = None,
+        tier: str = "",
+    ) -> dict:
+        """Record a render of `scene`, replacing its previous one.
+
+        Renders into a ladder `tier` are named after it, so they are kept
+        apart from a plain build at the same quality. Renders reused from the
+        cache have no `render_seconds` and are left as they are if the
+        manifest already has them. Returns the render's entry.
+        """
+        entry = self.scenes.setdefault(
+            scene.id, {"file": scene.file.as_posix(), "renders": {}}
+        )
+        name = self.render_name(settings, tier)
+        paths = [path.relative_to(self.output_path).as_posix() for path in artifacts]
+        previous = entry["renders"].get(name)
+        if previous is not None:
+            if (
+                render_seconds is None
+                and previous["source_hash"] == source_hash
+                and [record["path"] for record in previous["artifacts"]] == paths
+            ):
+                return previous
+            for record in previous["artifacts"]:
+                self.artifacts.pop(record["path"], None)
+
+        for relative in paths:
+            self.artifacts[relative] = {"scene": scene.id, "render": name}
+        entry["renders"][name] = render = {
+            "source_hash": source_hash,
+            "settings": {"format": settings.format, "quality": settings.quality},
+            "tier": tier,
+            "render_seconds": render_seconds,
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "artifacts": [
+                {"path": relative, **probe(path)}
+                for relative, path in zip(paths, artifacts)
+            ],
+        }
+        return render
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps(
+                {"scenes": self.scenes, "artifacts": self.artifacts},
+                indent=2,
+                sort_keys=True,
+            )
+        )
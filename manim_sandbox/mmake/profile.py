@@ -0,0 +1,205 @@
+import functools
+import json
+import logging
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from manim_sandbox.mmake.scenes import SceneJob
+
+log = logging.getLogger(__name__)
+
+# SceneFileWriter methods that make up the encode step
+ENCODE_METHODS = (
+    "write_frame",
+    "begin_animation",
+    "end_animation",
+    "combine_to_movie",
+    "save_final_image",
+)
+
+# Source files that mark what a sampled stack is spending time on. The
+# innermost matching frame decides; updaters are matched by code object.
+CATEGORY_FILES = {
+    "tex": ("tex_file_writing.py", "svg_mobject.py"),
+    "encode": ("scene_file_writer.py",),
+    "rasterize": ("camera.py", "cairo_renderer.py"),
+}
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class SceneProfiler:
+    """Instrument a scene render and sample its call stacks.
+
+    While active, `Scene.play`/`Scene.wait` calls and the file writer's
+    encode methods are timed exactly, every function registered with
+    `add_updater` is recorded, and a background thread samples the
+    rendering thread's stack. The samples give per-updater, TeX,
+    rasterization and encode estimates and a collapsed-stack profile for
+    flamegraph tools. Nothing is patched unless a profiler is entered.
+    """
+
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self.animations = []
+        self.encode = defaultdict(lambda: {"calls": 0, "seconds": 0.0})
+        self.updaters = {}
+        self.stacks = Counter()
+        self.total = 0.0
+        self._patches = []
+        self._depth = 0
+        self._stop = threading.Event()
+
+    def _patch(self, owner, name, wrapper_factory):
+        original = owner.__dict__[name]
+        setattr(owner, name, functools.wraps(original)(wrapper_factory(original)))
+        self._patches.append((owner, name, original))
+
+    def _timed_call(self, kind):
+        profiler = self
+
+        def factory(original):
+            def wrapper(scene, *args, **kwargs):
+                # Scene.wait plays a Wait animation; only count the outer call
+                if profiler._depth:
+                    return original(scene, *args, **kwargs)
+                profiler._depth += 1
+                start_time = scene.renderer.time
+                start = time.perf_counter()
+                try:
+                    return original(scene, *args, **kwargs)
+                finally:
+                    profiler._depth -= 1
+                    profiler.animations.append(
+                        {
+                            "index": len(profiler.animations),
+                            "kind": kind,
+                            "animations": [type(arg).__name__ for arg in args],
+                            "seconds": time.perf_counter() - start,
+                            "scene_time": scene.renderer.time - start_time,
+                        }
+                    )
+
+            return wrapper
+
+        return factory
+
+    def _timed_encode(self, name):
+        stats = self.encode[name]
+
+        def factory(original):
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    stats["calls"] += 1
+                    stats["seconds"] += time.perf_counter() - start
+
+            return wrapper
+
+        return factory
+
+    def _recorded_add_updater(self, original):
+        updaters = self.updaters
+
+        def wrapper(mobject, update_function, *args, **kwargs):
+            # Plain functions and lambdas, or bound methods
+            function = getattr(update_function, "__func__", update_function)
+            code = getattr(function, "__code__", None)
+            if code is not None:
+                updaters.setdefault(code, _frame_label(code))
+            return original(mobject, update_function, *args, **kwargs)
+
+        return wrapper
+
+    def _sample(self, thread_id):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def __enter__(self):
+        from manim import Mobject, Scene
+        from manim.scene.scene_file_writer import SceneFileWriter
+
+        self._patch(Scene, "play", self._timed_call("play"))
+        self._patch(Scene, "wait", self._timed_call("wait"))
+        self._patch(Mobject, "add_updater", self._recorded_add_updater)
+        for name in ENCODE_METHODS:
+            if name in SceneFileWriter.__dict__:
+                self._patch(SceneFileWriter, name, self._timed_encode(name))
+
+        self._sampler = threading.Thread(
+            target=self._sample, args=(threading.get_ident(),), daemon=True
+        )
+        self._start = time.perf_counter()
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.total = time.perf_counter() - self._start
+        self._stop.set()
+        self._sampler.join()
+        for owner, name, original in reversed(self._patches):
+            setattr(owner, name, original)
+        self._patches.clear()
+
+    def _category(self, stack):
+        for code in reversed(stack):
+            if code in self.updaters:
+                return "updaters", code
+            filename = Path(code.co_filename).name
+            for category, files in CATEGORY_FILES.items():
+                if filename in files:
+                    return category, None
+        return "other", None
+
+    def report(self, scene: SceneJob) -> dict:
+        samples = sum(self.stacks.values())
+        seconds_per_sample = self.total / samples if samples else 0.0
+        categories = Counter()
+        updaters = Counter()
+        for stack, count in self.stacks.items():
+            category, updater = self._category(stack)
+            categories[category] += count * seconds_per_sample
+            if updater is not None:
+                updaters[self.updaters[updater]] += count * seconds_per_sample
+        return {
+            "scene": scene.id,
+            "total_seconds": self.total,
+            "animations": self.animations,
+            "encode": dict(self.encode),
+            "estimated_seconds": {
+                "categories": dict(categories.most_common()),
+                "updaters": dict(updaters.most_common()),
+            },
+            "samples": samples,
+            "sample_interval": self.interval,
+        }
+
+    def folded_stacks(self) -> str:
+        """The samples in the collapsed format used by flamegraph tools."""
+        lines = (
+            ";".join(_frame_label(code) for code in stack) + f" {count}"
+            for stack, count in self.stacks.most_common()
+        )
+        return "\n".join(lines) + "\n"
+
+    def write(self, output_dir: Path, scene: SceneJob) -> Path:
+        """Write `<file>.<Scene>.json` and `.folded` into `output_dir`."""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        base = f"{scene.file.stem}.{scene.name}"
+        report_path = output_dir / f"{base}.json"
+        report_path.write_text(json.dumps(self.report(scene), indent=2))
+        (output_dir / f"{base}.folded").write_text(self.folded_stacks())
+        log.info(f"Profile for {scene.id} written to {report_path}")
+        return report_path
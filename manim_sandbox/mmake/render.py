@@ -0,0 +1,230 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from manim_sandbox.mmake.scenes import SceneJob
+
+log = logging.getLogger(__name__)
+
+# Ways a build can run manim
+ENGINES = ["subprocess", "inprocess", "stream"]
+
+# Default manim quality flag for each output format
+FORMAT_QUALITY = {"png": "k", "gif": "m", "mp4": "m"}
+
+# manim config names for the `-q` quality flags
+QUALITY_NAMES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+# Folder manim writes videos to for each quality, named after the resolution
+# and frame rate
+QUALITY_DIRS = {
+    "l": "480p15",
+    "m": "720p30",
+    "h": "1080p60",
+    "p": "1440p60",
+    "k": "2160p60",
+}
+
+# ru_maxrss is in kilobytes on Linux and in bytes on macOS
+MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+# File types manim writes as final outputs
+ARTIFACT_SUFFIXES = {".png", ".gif", ".mp4", ".mov", ".webm"}
+
+# Most colors a GIF palette holds
+GIF_COLORS = 256
+
+# Bump when mmake's GIF encoder changes its output, so cached GIFs are rebuilt
+GIF_ENCODER_VERSION = 2
+
+
+@dataclass(frozen=True)
+class RenderSettings:
+    """Output format and quality for a render.
+
+    GIFs are encoded by mmake, with at most `gif_colors` colors and scaled
+    down to `gif_max_height` pixels if the quality is taller.
+
+    With `last_frame`, a movie render also saves the frame it ends on as a
+    lossless PNG, where manim would put a still of the scene.
+    """
+
+    format: str = "gif"
+    quality: str = "m"
+    gif_colors: int = GIF_COLORS
+    gif_max_height: int | None = None
+    last_frame: bool = False
+
+    @classmethod
+    def for_format(cls, format: str, **options) -> "RenderSettings":
+        return cls(format=format, quality=FORMAT_QUALITY[format], **options)
+
+    def cli_args(self) -> list[str]:
+        if self.format == "png":
+            return [f"-q{self.quality}", "--save-png"]
+        return [f"-q{self.quality}", "--format", self.format]
+
+    def encoder_args(self) -> list[str]:
+        """The options mmake encodes the output with, besides `cli_args`."""
+        args = []
+        if self.format == "gif":
+            args.append(f"--gif-encoder={GIF_ENCODER_VERSION}")
+        if self.format == "gif" and self.gif_colors != GIF_COLORS:
+            args.append(f"--gif-colors={self.gif_colors}")
+        if self.format == "gif" and self.gif_max_height is not None:
+            args.append(f"--gif-max-height={self.gif_max_height}")
+        return args
+
+    def config(self, media_dir: Path) -> dict:
+        """The manim config overrides equivalent to `cli_args`."""
+        options = {
+            "quality": QUALITY_NAMES[self.quality],
+            "media_dir": str(media_dir),
+        }
+        if self.format == "png":
+            options.update(save_last_frame=True, write_to_movie=False)
+        else:
+            options.update(format=self.format, write_to_movie=True)
+        return options
+
+
+@dataclass
+class RenderResult:
+    """Exit status and timing of a single scene render."""
+
+    scene: SceneJob
+    returncode: int
+    duration: float
+    output: str = ""
+    artifacts: list[Path] = field(default_factory=list)
+    cached: bool = False
+    # Quality tier of a ladder build, if any
+    tier: str = ""
+    # Peak resident memory of the render process in bytes, where measured
+    peak_memory: int | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+    @property
+    def label(self) -> str:
+        return f"{self.scene.id} [{self.tier}]" if self.tier else self.scene.id
+
+
+def find_artifacts(scene: SceneJob, media_dir: Path, since: float) -> list[Path]:
+    """Find the outputs a render of `scene` wrote to `media_dir` after `since`."""
+    artifacts = []
+    for path in media_dir.rglob(f"{scene.name}*"):
+        if (
+            path.suffix in ARTIFACT_SUFFIXES
+            and scene.file.stem in path.parts
+            and "partial_movie_files" not in path.parts
+            and path.stat().st_mtime >= since
+        ):
+            artifacts.append(path)
+    return sorted(artifacts)
+
+
+def shared_dirs(shared_dir: Path) -> dict:
+    """Config that points a render at the TeX and text caches in `shared_dir`."""
+    return {"tex_dir": str(shared_dir / "Tex"), "text_dir": str(shared_dir / "texts")}
+
+
+def write_config(options: dict) -> Path:
+    """A temporary manim config file that sets `options`."""
+    with tempfile.NamedTemporaryFile(
+        "w", prefix="mmake-", suffix=".cfg", delete=False
+    ) as file:
+        file.write("[CLI]\n")
+        file.writelines(f"{name} = {value}\n" for name, value in options.items())
+    return Path(file.name)
+
+
+def render_scene(
+    scene: SceneJob,
+    settings: RenderSettings,
+    media_dir: Path,
+    capture_output: bool = False,
+    shared_dir: Path | None = None,
+) -> RenderResult:
+    """Render one scene in a manim subprocess.
+
+    The manim CLI cannot save the last frame of a movie, so renders with
+    `last_frame` run manim through `mmake.engine` in the subprocess instead.
+    With `shared_dir`, TeX and text are cached there instead of in
+    `media_dir`. On platforms with `os.wait4`, the result records the peak
+    memory of the manim process.
+    """
+    config_file = None
+    if settings.last_frame:
+        command = [sys.executable, "-m", "manim_sandbox.mmake.engine"]
+        command += [scene.project, str(scene.file), scene.name, str(media_dir)]
+        command += [json.dumps(asdict(settings))]
+        if shared_dir is not None:
+            command.append(str(shared_dir))
+    else:
+        command = ["manim", str(scene.file), scene.name] + settings.cli_args()
+        command += ["--media_dir", str(media_dir)]
+        if shared_dir is not None:
+            config_file = write_config(shared_dirs(shared_dir))
+            command += ["--config_file", str(config_file)]
+    try:
+        return run_render(scene, command, media_dir, capture_output)
+    finally:
+        if config_file is not None:
+            config_file.unlink()
+
+
+def run_render(
+    scene: SceneJob, command: list[str], media_dir: Path, capture_output: bool
+) -> RenderResult:
+    """Run a render `command` and collect what it wrote to `media_dir`."""
+    log.debug(f"Running: {' '.join(command)}")
+    started_at = time.time()
+    start = time.perf_counter()
+    try:
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE if capture_output else None,
+            stderr=subprocess.STDOUT if capture_output else None,
+            text=True,
+        )
+    except OSError as error:
+        # e.g. manim is not on the PATH
+        return RenderResult(scene, 127, time.perf_counter() - start, str(error))
+    output = process.stdout.read() if capture_output else ""
+    peak_memory = None
+    if hasattr(os, "wait4"):
+        # Reap the process ourselves to get its resource usage
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        peak_memory = usage.ru_maxrss * MAXRSS_UNIT
+    else:
+        process.wait()
+    if capture_output:
+        process.stdout.close()
+    duration = time.perf_counter() - start
+    artifacts = []
+    if process.returncode == 0:
+        artifacts = find_artifacts(scene, media_dir, since=started_at)
+    return RenderResult(
+        scene,
+        process.returncode,
+        duration,
+        output,
+        artifacts,
+        peak_memory=peak_memory,
+    )
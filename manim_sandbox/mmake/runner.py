@@ -0,0 +1,140 @@
+import logging
+import time
+import traceback
+from collections.abc import Callable, Hashable, Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TypeVar
+
+from manim_sandbox.mmake.render import RenderResult
+
+log = logging.getLogger(__name__)
+
+# Number of output lines to show for each failed scene
+FAILURE_TAIL_LINES = 20
+
+# Times the render at the head of the queue can be passed over by smaller
+# ones before the renders in flight are left to drain for it
+MAX_SKIPS = 3
+
+Job = TypeVar("Job", bound=Hashable)
+
+
+def run_jobs(
+    scenes: Sequence[Job],
+    render: Callable[[Job], RenderResult],
+    jobs: int = 1,
+    on_result: Callable[[RenderResult], None] | None = None,
+    memory: Mapping[Job, int] | None = None,
+    memory_budget: int | None = None,
+    failure: Callable[[Job, str, float], RenderResult] | None = None,
+    group: Callable[[Job], Hashable] | None = None,
+) -> list[RenderResult]:
+    """Render scenes with at most `jobs` renders in flight at once.
+
+    Each render is its own manim process, so a thread per slot is enough to
+    keep the pool busy. Renders start in the order of `scenes`, and results
+    are returned in that order. `on_result` is called with each result as
+    soon as it is done.
+
+    With a `memory_budget` in bytes, a render only starts while the
+    estimated `memory` of the renders in flight leaves room for it. When the
+    next render does not fit, a later one in the same `group` that fits can
+    go first, but only `MAX_SKIPS` times. After that nothing new starts
+    until the next render fits, so the order of `scenes` mostly holds. A
+    render that does not fit on its own runs alone.
+
+    A render or `on_result` call that raises becomes a failed result with
+    the traceback as its output, made by `failure` from the job, the
+    traceback and the seconds spent, and the other renders carry on. By
+    default the job is taken to be the scene.
+    """
+    memory = memory or {}
+    group = group or (lambda scene: None)
+    if failure is None:
+
+        def failure(scene: Job, output: str, duration: float) -> RenderResult:
+            return RenderResult(scene, 1, duration, output)
+
+    pending = list(scenes)
+    running = {}
+    started = {}
+    results = {}
+    skips = dict.fromkeys(scenes, 0)
+
+    def fits(scene: Job) -> bool:
+        if memory_budget is None or not running:
+            return True
+        in_use = sum(memory.get(other, 0) for other in running.values())
+        return in_use + memory.get(scene, 0) <= memory_budget
+
+    def next_scene() -> Job | None:
+        head = pending[0]
+        if fits(head):
+            return head
+        if skips[head] >= MAX_SKIPS:
+            return None
+        scene = next(
+            (
+                scene
+                for scene in pending[1:]
+                if group(scene) == group(head) and fits(scene)
+            ),
+            None,
+        )
+        if scene is not None:
+            skips[head] += 1
+        return scene
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            while pending and len(running) < jobs:
+                scene = next_scene()
+                if scene is None:
+                    break
+                pending.remove(scene)
+                started[scene] = time.perf_counter()
+                running[pool.submit(render, scene)] = scene
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                scene = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception:
+                    duration = time.perf_counter() - started[scene]
+                    result = failure(scene, traceback.format_exc(), duration)
+                results[scene] = result
+                status = "done" if result.ok else f"FAILED ({result.returncode})"
+                log.info(
+                    f"[{len(results)}/{len(scenes)}] {result.label} {status} "
+                    f"in {result.duration:.1f}s"
+                )
+                if on_result is None:
+                    continue
+                try:
+                    on_result(result)
+                except Exception:
+                    log.error(f"{result.label}: handling its result failed.")
+                    results[scene] = failure(
+                        scene, traceback.format_exc(), result.duration
+                    )
+    return [results[scene] for scene in scenes]
+
+
+def summarize(results: Sequence[RenderResult]) -> list[RenderResult]:
+    """Log a per-scene summary and return the failed results."""
+    failures = [result for result in results if not result.ok]
+    total = sum(result.duration for result in results)
+    log.info(f"Rendered {len(results)} scenes ({total:.1f}s of render time):")
+    for result in results:
+        if result.cached:
+            status = "cached"
+        else:
+            status = "ok" if result.ok else f"exit {result.returncode}"
+        log.info(f"  {result.label:<60} {status:>8} {result.duration:8.1f}s")
+    for result in failures:
+        tail = result.output.strip().splitlines()[-FAILURE_TAIL_LINES:]
+        if tail:
+            log.error(f"{result.label} failed:\n" + "\n".join(tail))
+        else:
+            log.error(f"{result.label} failed with exit {result.returncode}")
+    return failures
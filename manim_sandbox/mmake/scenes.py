@@ -0,0 +1,148 @@
+import ast
+from dataclasses import dataclass
+from pathlib import Path
+
+from manim_sandbox.mmake.graph import PACKAGE, module_path, resolve_import
+
+# Manim base classes that make a class renderable as a scene
+SCENE_BASES = {
+    "Scene",
+    "MovingCameraScene",
+    "ZoomedScene",
+    "ThreeDScene",
+    "SpecialThreeDScene",
+    "VectorScene",
+    "LinearTransformationScene",
+}
+
+
+@dataclass(frozen=True)
+class SceneJob:
+    """A single `Scene` subclass to render."""
+
+    project: str
+    file: Path
+    name: str
+
+    @property
+    def id(self) -> str:
+        return f"{self.project}:{self.file.stem}:{self.name}"
+
+
+class SceneFinder:
+    """Finds scene classes by parsing sources instead of importing them.
+
+    A class is a scene if one of its bases is a manim scene class or another
+    scene, including scenes imported from other sandbox modules under any
+    alias. Imported modules are parsed once per finder.
+    """
+
+    def __init__(self, root: Path = Path(".")):
+        self.root = root
+        self._scanned = {}
+
+    def scene_classes(self, path: Path) -> list[str]:
+        """Return the names of the scene classes defined in a file, in order."""
+        return self._scan(path)[0]
+
+    def _module_scenes(self, module: str) -> set[str]:
+        """Scene names visible at the top level of a sandbox module."""
+        if module.split(".")[0] != PACKAGE:
+            return set()
+        path = module_path(module, self.root)
+        return self._scan(path)[1] if path is not None else set()
+
+    def _scan(self, path: Path) -> tuple[list[str], set[str]]:
+        if path in self._scanned:
+            return self._scanned[path]
+        # Import cycles see a partially scanned module as having no scenes
+        defined, visible = [], set(SCENE_BASES)
+        self._scanned[path] = (defined, visible)
+        modules = {}
+        tree = ast.parse(path.read_text(), filename=str(path))
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    modules[alias.asname or alias.name] = alias.name
+            elif isinstance(node, ast.ImportFrom):
+                module = resolve_import(node, path, self.root)
+                if module is None:
+                    continue
+                scenes = (
+                    SCENE_BASES
+                    if module.split(".")[0] == "manim"
+                    else self._module_scenes(module)
+                )
+                for alias in node.names:
+                    if alias.name == "*":
+                        visible.update(
+                            name for name in scenes if not name.startswith("_")
+                        )
+                    elif alias.name in scenes:
+                        visible.add(alias.asname or alias.name)
+                    else:
+                        # `from package import module`
+                        modules[alias.asname or alias.name] = (
+                            f"{module}.{alias.name}"
+                        )
+            elif isinstance(node, ast.ClassDef):
+                if any(self._is_scene(base, visible, modules) for base in node.bases):
+                    defined.append(node.name)
+                    visible.add(node.name)
+        return defined, visible
+
+    def _is_scene(self, base: ast.expr, visible: set[str], modules: dict) -> bool:
+        if isinstance(base, ast.Name):
+            return base.id in visible
+        if isinstance(base, ast.Attribute):
+            owner = modules.get(ast.unparse(base.value))
+            if owner is not None and owner.split(".")[0] == PACKAGE:
+                return base.attr in self._module_scenes(owner)
+            # e.g. `manim.Scene`
+            return base.attr in SCENE_BASES
+        return False
+
+
+def find_scene_classes(file_path: Path, root: Path = Path(".")) -> list[str]:
+    """Return the names of the scene classes defined in a file, in order."""
+    return SceneFinder(root).scene_classes(file_path)
+
+
+def discover_scenes(
+    project_name: str, project_path: Path, finder: SceneFinder | None = None
+) -> list[SceneJob]:
+    """Find every scene in a project folder without importing it."""
+    finder = finder or SceneFinder()
+    return [
+        SceneJob(project=project_name, file=file_path, name=name)
+        for file_path in sorted(project_path.glob("*.py"))
+        for name in finder.scene_classes(file_path)
+    ]
+
+
+def parse_selector(selector: str) -> tuple[str, str | None, str | None]:
+    """Split a `project[:file[:SceneName]]` selector into its parts."""
+    parts = selector.split(":")
+    if len(parts) > 3 or not all(parts):
+        raise ValueError(
+            f"Invalid selector '{selector}', expected project[:file[:SceneName]]."
+        )
+    project, file_stem, name = parts + [None] * (3 - len(parts))
+    return project, file_stem, name
+
+
+def select_scenes(selector: str, src_dir: Path) -> list[SceneJob]:
+    """Find the scenes matching a `project[:file[:SceneName]]` selector."""
+    project, file_stem, name = parse_selector(selector)
+    project_path = src_dir / project
+    if not project_path.is_dir():
+        raise ValueError(f"Project '{project}' does not exist in {src_dir}.")
+    scenes = [
+        scene
+        for scene in discover_scenes(project, project_path, SceneFinder(src_dir.parent))
+        if (file_stem is None or scene.file.stem == file_stem.removesuffix(".py"))
+        and (name is None or scene.name == name)
+    ]
+    if not scenes:
+        raise ValueError(f"No scenes match '{selector}'.")
+    return scenes
@@ -0,0 +1,201 @@
+import logging
+import time
+from collections.abc import Sequence
+from dataclasses import replace
+from pathlib import Path
+
+from manim_sandbox.mmake.encode import encode, output_path, run_ffmpeg
+from manim_sandbox.mmake.engine import (
+    WarmWorkerPool,
+    load_scene_class,
+    render_in_process,
+)
+from manim_sandbox.mmake.render import RenderResult, RenderSettings, shared_dirs
+from manim_sandbox.mmake.scenes import SceneJob
+
+log = logging.getLogger(__name__)
+
+# Skipping every animation lets a dry run step through a scene without
+# rendering any frames
+SKIP_ALL = 10**9
+
+
+def time_animations(
+    scene: SceneJob, media_dir: Path, shared_dir: Path | None = None
+) -> list[float]:
+    """Run `scene` without rendering and return the run time of each `play`.
+
+    Waits count as plays, as they do for manim's animation numbers. TeX is
+    cached in `shared_dir`, or in `media_dir` without one.
+    """
+    from manim import tempconfig
+
+    options = {
+        "dry_run": True,
+        "from_animation_number": SKIP_ALL,
+        "input_file": str(scene.file),
+        "media_dir": str(media_dir),
+        "progress_bar": "none",
+        "verbosity": "WARNING",
+        **shared_dirs(shared_dir or media_dir),
+    }
+    durations = []
+    with tempconfig(options):
+        instance = load_scene_class(scene)()
+        renderer = instance.renderer
+        play = renderer.play
+
+        def timed_play(*args, **kwargs):
+            before = renderer.time
+            play(*args, **kwargs)
+            durations.append(renderer.time - before)
+
+        renderer.play = timed_play
+        instance.render()
+    return durations
+
+
+def split_ranges(durations: Sequence[float], segments: int) -> list[tuple[int, int]]:
+    """Split animations into contiguous `(start, stop)` ranges of similar length.
+
+    Every range holds at least one animation and the first holds at least
+    two, since manim reads an `upto_animation_number` of 0 as no limit. So
+    fewer than `segments` ranges come back for short scenes.
+    """
+    count = len(durations)
+    segments = max(1, min(segments, count - 1))
+    weights = list(durations) if sum(durations) > 0 else [1.0] * count
+    total = sum(weights)
+
+    cuts = []
+    elapsed = 0.0
+    for index, weight in enumerate(weights[:-1]):
+        needed = segments - 1 - len(cuts)
+        if not needed:
+            break
+        elapsed += weight
+        if index == 0:
+            continue
+        # Cut once this range has its share, or when every remaining
+        # animation is needed to give each later range one
+        if elapsed >= total * (len(cuts) + 1) / segments or (
+            count - index - 1 == needed
+        ):
+            cuts.append(index + 1)
+    bounds = [0, *cuts, count]
+    return list(zip(bounds, bounds[1:]))
+
+
+def segment_overrides(first: int, stop: int, count: int) -> dict:
+    """manim config that renders animations `first` to `stop - 1` of `count`."""
+    overrides = {"from_animation_number": first}
+    if stop < count:
+        if stop < 2:
+            raise ValueError(f"Cannot end a segment after animation {stop - 1}.")
+        overrides["upto_animation_number"] = stop - 1
+    return overrides
+
+
+def stitch(parts: Sequence[Path], movie: Path, work_dir: Path) -> tuple[int, str]:
+    """Join segment movies in order into `movie`.
+
+    Segments share codec settings, so they are concatenated without
+    re-encoding.
+    """
+    movie.parent.mkdir(parents=True, exist_ok=True)
+    list_file = work_dir / "segments.txt"
+    list_file.write_text(
+        "".join(f"file '{part.resolve().as_posix()}'\n" for part in parts)
+    )
+    return run_ffmpeg(
+        ["-f", "concat", "-safe", "0", "-i", str(list_file), "-c", "copy", str(movie)]
+    )
+
+
+def render_segmented(
+    scene: SceneJob,
+    settings: RenderSettings,
+    media_dir: Path,
+    segments: int,
+    pool: WarmWorkerPool,
+    gif_workers: int = 1,
+    shared_dir: Path | None = None,
+) -> RenderResult:
+    """Render ranges of a scene's animations in parallel and stitch them.
+
+    Each worker fast-forwards the scene through the animations before its
+    range without rendering them, then renders its range to a movie of its
+    own under `media_dir/segments`. A GIF is encoded from the stitched movie
+    with up to `gif_workers` processes. With `settings.last_frame`, the last
+    range's worker saves the frame the scene ends on. Every worker caches
+    TeX in `shared_dir`, or in `media_dir` without one.
+    """
+    shared_dir = shared_dir or media_dir
+    if settings.format == "png":
+        return pool.render(scene, settings, media_dir, shared_dir=shared_dir)
+    start = time.perf_counter()
+
+    def failed(message: str) -> RenderResult:
+        return RenderResult(scene, 1, time.perf_counter() - start, message)
+
+    try:
+        durations = pool.submit(
+            time_animations, scene, media_dir, shared_dir
+        ).result()
+    except Exception as error:
+        return failed(f"Could not step through the scene: {error!r}")
+    if not durations:
+        return pool.render(scene, settings, media_dir, shared_dir=shared_dir)
+
+    ranges = split_ranges(durations, segments)
+    log.debug(f"{scene.id}: {len(durations)} animations in ranges {ranges}")
+    work_dir = media_dir / "segments" / scene.file.stem / scene.name
+    movie_settings = RenderSettings("mp4", settings.quality)
+    last_settings = replace(movie_settings, last_frame=settings.last_frame)
+    futures = [
+        pool.submit(
+            render_in_process,
+            scene,
+            last_settings if index == len(ranges) - 1 else movie_settings,
+            work_dir / f"{index:03d}",
+            quiet=True,
+            overrides={
+                **segment_overrides(first, stop, len(durations)),
+                "output_file": f"{scene.name}_part{index:03d}",
+                # Segments never share partial movies, so skip hashing plays
+                "disable_caching": True,
+            },
+            shared_dir=shared_dir,
+        )
+        for index, (first, stop) in enumerate(ranges)
+    ]
+    parts = []
+    frames = []
+    for (first, stop), future in zip(ranges, futures):
+        try:
+            result = future.result()
+        except Exception as error:
+            return failed(f"Animations {first}-{stop - 1} crashed: {error!r}")
+        movies = [path for path in result.artifacts if path.suffix == ".mp4"]
+        if not result.ok or not movies:
+            return failed(f"Animations {first}-{stop - 1} failed:\n{result.output}")
+        parts.append(movies[0])
+        frames = [path for path in result.artifacts if path.suffix == ".png"]
+
+    movie = output_path(scene, movie_settings, media_dir)
+    returncode, message = stitch(parts, movie, work_dir)
+    if returncode:
+        return failed(f"Could not stitch segments:\n{message}")
+    returncode, message, output = encode(
+        movie, scene, settings, media_dir, gif_workers
+    )
+    if returncode:
+        return failed(f"Could not encode the stitched movie:\n{message}")
+    artifacts = [output]
+    if settings.last_frame:
+        if not frames:
+            return failed("The last range saved no frame.")
+        still = output_path(scene, RenderSettings("png", settings.quality), media_dir)
+        still.parent.mkdir(parents=True, exist_ok=True)
+        artifacts.append(frames[0].replace(still))
+    return RenderResult(scene, 0, time.perf_counter() - start, artifacts=artifacts)
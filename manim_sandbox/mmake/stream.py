@@ -0,0 +1,370 @@
+import logging
+import queue
+from abc import ABC, abstractmethod
+import subprocess
+import threading
+import time
+import traceback
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+from manim import config, tempconfig
+from manim.scene.scene_file_writer import SceneFileWriter
+
+from manim_sandbox.mmake.encode import (
+    ffmpeg_command,
+    master_settings,
+    output_args,
+    gif_size,
+    output_path,
+    quality_size,
+)
+from manim_sandbox.mmake.engine import load_scene_class
+from manim_sandbox.mmake.frames import FrameRuns
+from manim_sandbox.mmake.gif import GifWriter
+from manim_sandbox.mmake.render import RenderResult, RenderSettings, shared_dirs
+from manim_sandbox.mmake.scenes import SceneJob
+
+log = logging.getLogger(__name__)
+
+# Frames each output may fall behind the renderer before it has to wait
+QUEUE_SIZE = 16
+
+# Encoder classes by output format
+ENCODERS: dict[str, type["Encoder"]] = {}
+
+
+def encoder(format: str):
+    """Register the decorated class as the encoder for `format`."""
+
+    def register(cls):
+        ENCODERS[format] = cls
+        return cls
+
+    return register
+
+
+class Encoder(ABC):
+    """Writes a stream of RGBA frames of one size to `path`.
+
+    Encoders that can spread their work over processes use up to `workers`.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        settings: RenderSettings,
+        width: int,
+        height: int,
+        rate: float,
+        workers: int = 1,
+    ):
+        self.path = path
+        self.settings = settings
+        self.width = width
+        self.height = height
+        self.rate = rate
+        self.workers = workers
+
+    @abstractmethod
+    def write(self, frame: np.ndarray, count: int = 1):
+        """Append `frame`, shown for `count` frames."""
+
+    def close(self):
+        """Finish the output file."""
+
+
+@encoder("mp4")
+class FfmpegEncoder(Encoder):
+    """Pipes raw frames into an ffmpeg process that encodes the output."""
+
+    def __init__(self, path, settings, width, height, rate, workers=1):
+        super().__init__(path, settings, width, height, rate, workers)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # ffmpeg_command overwrites the output; frames come in on stdin
+        command = ffmpeg_command(
+            [
+                "-f",
+                "rawvideo",
+                "-pix_fmt",
+                "rgba",
+                "-s",
+                f"{width}x{height}",
+                "-r",
+                str(rate),
+                "-i",
+                "-",
+                *output_args(settings, path),
+            ]
+        )
+        log.debug(f"Running: {' '.join(command)}")
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+
+    def write(self, frame, count=1):
+        data = np.ascontiguousarray(frame).data
+        for _ in range(count):
+            self.process.stdin.write(data)
+
+    def close(self):
+        self.process.stdin.close()
+        errors = self.process.stderr.read().decode(errors="replace")
+        if self.process.wait():
+            raise RuntimeError(
+                f"ffmpeg exited with {self.process.returncode} writing "
+                f"{self.path}:\n{errors}"
+            )
+
+
+@encoder("gif")
+class GifEncoder(Encoder):
+    """Writes a GIF that shows a repeated frame once, with a longer delay."""
+
+    def __init__(self, path, settings, width, height, rate, workers=1):
+        super().__init__(path, settings, width, height, rate, workers)
+        _, target_rate = quality_size(settings.quality)
+        self.writer = GifWriter(
+            path,
+            gif_size(width, height, settings),
+            target_rate,
+            rate,
+            colors=settings.gif_colors,
+            workers=workers,
+        )
+
+    def write(self, frame, count=1):
+        self.writer.write(frame, count)
+
+    def close(self):
+        self.writer.close()
+
+
+@encoder("png")
+class LastFrameEncoder(FfmpegEncoder):
+    """Saves only the last frame of the stream."""
+
+    def __init__(self, path, settings, width, height, rate, workers=1):
+        super().__init__(path, settings, width, height, rate, workers)
+        self.last_frame = None
+
+    def write(self, frame, count=1):
+        self.last_frame = frame
+
+    def close(self):
+        if self.last_frame is not None:
+            super().write(self.last_frame)
+        super().close()
+
+
+class EncoderStream:
+    """Feeds frames to an encoder on its own thread through a bounded queue.
+
+    Puts that find the queue full are counted and timed. They show how long
+    the renderer waited on this encoder.
+    """
+
+    def __init__(self, encoder: Encoder, queue_size: int = QUEUE_SIZE):
+        self.encoder = encoder
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.frames = 0
+        self.blocked_puts = 0
+        self.blocked_seconds = 0.0
+        self.max_depth = 0
+        self.error = None
+        self.thread = threading.Thread(target=self._drain, daemon=True)
+        self.thread.start()
+
+    def put(self, frame: np.ndarray, count: int = 1):
+        item = (frame, count)
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            start = time.perf_counter()
+            self.queue.put(item)
+            self.blocked_puts += 1
+            self.blocked_seconds += time.perf_counter() - start
+        self.frames += count
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def _drain(self):
+        while (item := self.queue.get()) is not None:
+            # After a failure keep emptying the queue so the renderer
+            # never blocks on it
+            if self.error is None:
+                try:
+                    self.encoder.write(*item)
+                except Exception as error:
+                    self.error = error
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        try:
+            self.encoder.close()
+        except Exception as error:
+            self.error = self.error or error
+        if self.error is not None:
+            raise self.error
+
+    def report(self) -> str:
+        return (
+            f"{self.encoder.settings.format}: {self.frames} frames, "
+            f"{self.blocked_puts} blocked puts ({self.blocked_seconds:.2f}s), "
+            f"max queue depth {self.max_depth}/{self.queue.maxsize}"
+        )
+
+
+class StreamingFileWriter(SceneFileWriter):
+    """A scene file writer that streams frames to encoders.
+
+    manim normally writes a partial movie per animation, concatenates them
+    and converts the result. Here each output gets a bounded queue feeding an
+    encoder thread instead, so nothing but the final outputs touches the
+    disk. Runs of identical frames are passed on as one frame with a count,
+    which encoders can hold instead of encoding every copy.
+    """
+
+    def __init__(
+        self,
+        renderer,
+        scene_name,
+        outputs: Sequence[tuple[Path, RenderSettings]] = (),
+        queue_size: int = QUEUE_SIZE,
+        workers: int = 1,
+        **kwargs,
+    ):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.scene_name = scene_name
+        self.outputs = outputs
+        self.queue_size = queue_size
+        self.workers = workers
+        self.streams = []
+        self.runs = FrameRuns()
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        pass
+
+    def end_animation(self, allow_write=False):
+        pass
+
+    def write_frame(self, frame_or_renderer, num_frames=1):
+        if not config.write_to_movie:
+            return
+        run = self.runs.add(frame_or_renderer, num_frames)
+        if run is not None:
+            self.put(*run)
+
+    def put(self, frame: np.ndarray, count: int):
+        if not self.streams:
+            self.open_streams(frame)
+        for stream in self.streams:
+            stream.put(frame, count)
+
+    def open_streams(self, frame: np.ndarray):
+        height, width = frame.shape[:2]
+        self.streams = [
+            EncoderStream(
+                ENCODERS[settings.format](
+                    path, settings, width, height, config.frame_rate, self.workers
+                ),
+                self.queue_size,
+            )
+            for path, settings in self.outputs
+        ]
+
+    def combine_to_movie(self):
+        pass
+
+    def save_final_image(self, image):
+        # manim saves a still instead of finishing a scene without plays, so
+        # stream that still as the scene's only frame
+        if not self.streams:
+            self.put(np.asarray(image), 1)
+            self.finish()
+
+    def finish(self):
+        run = self.runs.flush()
+        if run is not None:
+            self.put(*run)
+        errors = []
+        for stream in self.streams:
+            try:
+                stream.close()
+            except Exception as error:
+                errors.append(error)
+            log.debug(f"{self.scene_name}: {stream.report()}")
+        log.debug(f"{self.scene_name}: {self.report()}")
+        if errors:
+            raise errors[0]
+
+    def report(self) -> str:
+        return (
+            f"{self.runs.duplicates} of {self.runs.frames} frames "
+            f"repeated the previous one"
+        )
+
+
+def render_streaming(
+    scene: SceneJob,
+    formats: Sequence[RenderSettings],
+    media_dir: Path,
+    queue_size: int = QUEUE_SIZE,
+    quiet: bool = False,
+    gif_workers: int = 1,
+    shared_dir: Path | None = None,
+) -> RenderResult:
+    """Render one scene in process, streaming its frames to every format.
+
+    Frames are rendered once at the highest requested quality. A scene
+    without plays streams its final frame as its only frame. GIFs are
+    encoded with up to `gif_workers` processes. The result's output holds a
+    backpressure report for each format and the number of repeated frames.
+    The render fails if any output was not written. With `shared_dir`, TeX
+    and text are cached there instead of in `media_dir`.
+    """
+    options = master_settings(formats).config(media_dir)
+    # Frames never hit the disk, so there are no partial movies to reuse
+    options.update(input_file=str(scene.file), disable_caching=True)
+    if quiet:
+        options.update(progress_bar="none", verbosity="WARNING")
+    if shared_dir is not None:
+        options.update(shared_dirs(shared_dir))
+    outputs = [
+        (output_path(scene, settings, media_dir), settings) for settings in formats
+    ]
+
+    start = time.perf_counter()
+    try:
+        scene_class = load_scene_class(scene)
+        with tempconfig(options):
+            # Let the scene build its own renderer, which may use its own
+            # camera, and only swap out the file writer
+            instance = scene_class()
+            instance.renderer.file_writer = StreamingFileWriter(
+                instance.renderer,
+                scene_class.__name__,
+                outputs=outputs,
+                queue_size=queue_size,
+                workers=gif_workers,
+            )
+            instance.render()
+    except Exception:
+        return RenderResult(
+            scene, 1, time.perf_counter() - start, traceback.format_exc()
+        )
+    duration = time.perf_counter() - start
+    writer = instance.renderer.file_writer
+    report = "\n".join(
+        [*(stream.report() for stream in writer.streams), writer.report()]
+    )
+    missing = [str(path) for path, _ in outputs if not path.exists()]
+    if missing:
+        return RenderResult(
+            scene, 1, duration, f"{report}\nNo output written to {', '.join(missing)}."
+        )
+    return RenderResult(scene, 0, duration, report, [path for path, _ in outputs])
@@ -0,0 +1,90 @@
+import ast
+import logging
+import multiprocessing
+import time
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+# Mobjects whose construction compiles LaTeX
+TEX_CLASSES = {"Tex", "MathTex", "SingleStringMathTex", "SingleStringTex"}
+
+
+def _call_name(node: ast.Call) -> str | None:
+    # Handle both `MathTex(...)` and `manim.MathTex(...)`
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    if isinstance(node.func, ast.Attribute):
+        return node.func.attr
+    return None
+
+
+def collect_tex_calls(paths: Iterable[Path]) -> list[str]:
+    """Source of every TeX mobject construction in `paths`, deduplicated.
+
+    Calls are normalized with `ast.unparse`, so the same call written with
+    different formatting is only compiled once.
+    """
+    calls = {}
+    for path in paths:
+        tree = ast.parse(path.read_text(), filename=str(path))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Call) and _call_name(node) in TEX_CLASSES:
+                calls.setdefault(ast.unparse(node))
+    return list(calls)
+
+
+def compile_tex_call(call: str, media_dir: Path) -> tuple[str, str | None]:
+    """Build one TeX mobject so its SVG lands in manim's TeX cache.
+
+    Returns the error, if any. Calls that refer to local variables cannot be
+    evaluated statically and are reported as `"dynamic"`.
+    """
+    import manim
+    from manim import tempconfig
+
+    namespace = {
+        name: getattr(manim, name) for name in dir(manim) if not name.startswith("_")
+    }
+    try:
+        with tempconfig({"media_dir": str(media_dir)}):
+            eval(call, namespace)
+    except NameError:
+        return call, "dynamic"
+    except Exception as error:
+        return call, str(error) or type(error).__name__
+    return call, None
+
+
+def precompile_tex(calls: list[str], media_dir: Path, jobs: int = 1):
+    """Compile TeX for `calls` in parallel into `media_dir`'s TeX cache.
+
+    Renders using the same media dir then find every SVG already built, so
+    LaTeX and dvisvgm no longer run scene by scene during the build.
+    """
+    if not calls:
+        return
+    log.info(f"Precompiling {len(calls)} TeX expressions into {media_dir}...")
+    start = time.perf_counter()
+    compiled = dynamic = 0
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(calls)),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        results = pool.map(
+            compile_tex_call, calls, [media_dir] * len(calls), chunksize=4
+        )
+        for call, error in results:
+            if error is None:
+                compiled += 1
+            elif error == "dynamic":
+                dynamic += 1
+                log.debug(f"Skipping TeX that depends on local values: {call}")
+            else:
+                log.warning(f"Could not precompile {call}: {error}")
+    log.info(
+        f"Precompiled {compiled} TeX expressions in "
+        f"{time.perf_counter() - start:.1f}s ({dynamic} left to render time)."
+    )
@@ -0,0 +1,119 @@
+import logging
+import stat
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from manim_sandbox.mmake.engine import WarmWorkerPool
+from manim_sandbox.mmake.graph import ImportGraph
+from manim_sandbox.mmake.render import RenderSettings
+from manim_sandbox.mmake.scenes import SceneJob, parse_selector, select_scenes
+
+log = logging.getLogger(__name__)
+
+
+def snapshot(folders: Sequence[Path]) -> dict[Path, int]:
+    """Modification times of the Python sources under `folders`.
+
+    Only regular files count. Paths that vanish before they are read, or
+    dangling links like the lock files some editors leave, are skipped.
+    """
+    times = {}
+    for folder in folders:
+        for path in folder.rglob("*.py"):
+            try:
+                status = path.stat()
+            except OSError:
+                continue
+            if stat.S_ISREG(status.st_mode):
+                times[path] = status.st_mtime_ns
+    return times
+
+
+def changed_files(before: dict[Path, int], after: dict[Path, int]) -> set[Path]:
+    return {
+        path
+        for path in before.keys() | after.keys()
+        if before.get(path) != after.get(path)
+    }
+
+
+def watch(
+    selectors: Sequence[str],
+    src_dir: Path,
+    output_dir: Path,
+    settings: RenderSettings,
+    interval: float = 0.5,
+):
+    """Re-render affected scenes whenever their sources change.
+
+    Renders go to a single warm worker that keeps manim and its caches
+    loaded between runs, so only the scene itself is re-executed.
+    """
+    projects = dict.fromkeys(parse_selector(selector)[0] for selector in selectors)
+    folders = [src_dir / project for project in projects] + [src_dir / "common"]
+    log.info(f"Watching {', '.join(str(folder) for folder in folders)}...")
+
+    state = snapshot(folders)
+    pool = WarmWorkerPool(1)
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot(folders)
+            if current == state:
+                continue
+            # Wait for editors that save in several steps to settle
+            while True:
+                time.sleep(interval)
+                settled = snapshot(folders)
+                if settled == current:
+                    break
+                current = settled
+            changed = changed_files(state, current)
+            state = current
+            for scene in affected_scenes(selectors, src_dir, changed):
+                pool = render_preview(pool, scene, settings, output_dir)
+    except KeyboardInterrupt:
+        log.info("Stopped watching.")
+    finally:
+        pool.close()
+
+
+def affected_scenes(
+    selectors: Sequence[str], src_dir: Path, changed: set[Path]
+) -> list[SceneJob]:
+    # Rebuild the graph every time, since edits can add or drop imports
+    graph = ImportGraph(src_dir.parent)
+    scenes = []
+    for selector in selectors:
+        try:
+            matches = select_scenes(selector, src_dir)
+        except (ValueError, SyntaxError) as error:
+            log.warning(f"Skipping '{selector}': {error}")
+            continue
+        scenes.extend(
+            scene
+            for scene in matches
+            if scene not in scenes and graph.affected_by(scene.file, changed)
+        )
+    return scenes
+
+
+def render_preview(
+    pool: WarmWorkerPool,
+    scene: SceneJob,
+    settings: RenderSettings,
+    output_dir: Path,
+) -> WarmWorkerPool:
+    """Render a scene, replacing the worker if it crashed."""
+    log.info(f"Rendering {scene.id}...")
+    result = pool.render(scene, settings, output_dir / scene.project, quiet=False)
+    if result.ok:
+        artifacts = ", ".join(str(path) for path in result.artifacts)
+        log.info(f"{scene.id} done in {result.duration:.1f}s: {artifacts}")
+        return pool
+    log.error(f"{scene.id} failed:\n{result.output.strip()}")
+    if pool.broken:
+        pool.close()
+        pool = WarmWorkerPool(1)
+    return pool
@@ -1,6 +1,8 @@
 from manim import *
 
-class InertialReferenceFrames(ZoomedScene):
+from manim_sandbox.common.scenes import SandboxZoomedScene
+
+class InertialReferenceFrames(SandboxZoomedScene):
     """
     An **inertial reference frame** is a frame of reference in which a body at
     rest remains at rest and a body in motion moves at a constant speed in a
@@ -8,9 +10,9 @@ class InertialReferenceFrames(ZoomedScene):
 
     ([source](https://openstax.org/books/university-physics-volume-3/pages/5-1-invariance-of-physical-laws))
     """
+
     def __init__(self, **kwargs):   #HEREFROM
-        ZoomedScene.__init__(
-            self,
+        super().__init__(
             zoom_factor=0.5,
             zoomed_display_height=4,
             zoomed_display_width=4,
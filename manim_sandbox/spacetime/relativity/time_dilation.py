@@ -2,35 +2,251 @@ from manim import *
 from manim.typing import Vector3D
 
 from manim_sandbox.common.compound_objects import TwoOpposingWalls, AnalogClock
+from manim_sandbox.common.factory import cached
+from manim_sandbox.common.scenes import SandboxScene
+
+
+class PhotonTrace(TracedPath):
+    """A TracedPath that keeps a running total of its own length.
+
+    Each frame appends a straight segment, so the total only needs the length
+    of that segment. If the points are changed any other way (an animation,
+    dissipation, clearing), the total is recomputed in one vectorized pass
+    the next time it is read.
+
+    Passing `max_points`, `time_window` or `decimate` keeps the path's
+    vertices in a preallocated ring buffer instead. `max_points` caps the
+    number of vertices, `time_window` drops the part of the path traced more
+    than that many seconds ago, and `decimate` merges collinear segments so
+    a bouncing photon only keeps its bounce vertices. In this mode the trace
+    owns its points and the length is the total distance traced since the
+    last `reset`, including any part that has since been dropped.
+    """
+
+    # Smallest ring buffer allocated when the vertex count is unbounded
+    MIN_CAPACITY = 64
+    # Sine of the largest angle between segments that still counts as straight
+    COLLINEAR_TOLERANCE = 1e-6
+
+    def __init__(
+        self,
+        *args,
+        max_points: int | None = None,
+        time_window: float | None = None,
+        decimate: bool = False,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        if max_points is not None and max_points < 2:
+            raise ValueError("max_points must be at least 2.")
+        self.max_points = max_points
+        self.time_window = time_window
+        self.decimate = decimate
+        self.bounded = max_points is not None or time_window is not None or decimate
+        self._length = 0.0
+        self._measured_points = 0
+        self._last_point = None
+        if self.bounded:
+            self._allocate(max_points or self.MIN_CAPACITY)
+            self._clock = 0.0
+
+    def _allocate(self, capacity):
+        # Vertices are stored twice, at i and i + capacity, so the live
+        # vertices are always one contiguous slice however the ring wraps
+        self._capacity = capacity
+        self._vertices = np.zeros((2 * capacity, 3))
+        self._times = np.zeros(capacity)
+        self._path_points = np.zeros((4 * max(capacity - 1, 1), 3))
+        self._start = 0
+        self._count = 0
+
+    def _grow(self):
+        vertices = self._live_vertices().copy()
+        times = self._times[
+            (self._start + np.arange(self._count)) % self._capacity
+        ]
+        self._allocate(2 * self._capacity)
+        for vertex, time in zip(vertices, times):
+            self._push(vertex, time)
+
+    def _live_vertices(self):
+        return self._vertices[self._start : self._start + self._count]
+
+    def _set_vertex(self, index, point, time):
+        slot = (self._start + index) % self._capacity
+        self._vertices[slot] = point
+        self._vertices[slot + self._capacity] = point
+        self._times[slot] = time
+
+    def _push(self, point, time):
+        if self._count == self._capacity:
+            if self.max_points is None:
+                self._grow()
+            else:
+                self._drop_oldest()
+        self._count += 1
+        self._set_vertex(self._count - 1, point, time)
+
+    def _drop_oldest(self):
+        self._start = (self._start + 1) % self._capacity
+        self._count -= 1
+
+    def _extends_last_segment(self, point):
+        if self._count < 2:
+            return False
+        live = self._live_vertices()
+        previous = live[-1] - live[-2]
+        step = point - live[-1]
+        if np.dot(previous, step) <= 0:
+            return False
+        cross = np.linalg.norm(np.cross(previous, step))
+        scale = np.linalg.norm(previous) * np.linalg.norm(step)
+        return cross <= self.COLLINEAR_TOLERANCE * scale
+
+    def _trim(self):
+        cutoff = self._clock - self.time_window
+        times = self._times
+        capacity = self._capacity
+        while self._count > 1 and times[(self._start + 1) % capacity] <= cutoff:
+            self._drop_oldest()
+        first = self._start
+        second = (self._start + 1) % capacity
+        if self._count >= 2 and times[first] < cutoff < times[second]:
+            # Clip the oldest segment to the window, assuming uniform motion
+            live = self._live_vertices()
+            alpha = (cutoff - times[first]) / (times[second] - times[first])
+            self._set_vertex(0, interpolate(live[0], live[1], alpha), cutoff)
+
+    def _write_points(self):
+        # Rebuild the stroke as straight cubic segments between vertices,
+        # matching what TracedPath's add_line_to would have produced
+        live = self._live_vertices()
+        if len(live) == 1:
+            points = self._path_points[:4]
+            points[:] = live[0]
+        else:
+            points = self._path_points[: 4 * (len(live) - 1)]
+            starts = live[:-1]
+            points[0::4] = starts
+            points[3::4] = live[1:]
+            np.subtract(live[1:], starts, out=points[1::4])
+            points[2::4] = points[1::4]
+            points[1::4] *= 1 / 3
+            points[1::4] += starts
+            points[2::4] *= 2 / 3
+            points[2::4] += starts
+        self.points = points
+
+    def _in_sync(self):
+        return (
+            not self.dissipating_time
+            and len(self.points) == self._measured_points
+            and (
+                self._last_point is None
+                or np.array_equal(self.points[-1], self._last_point)
+            )
+        )
+
+    def _mark_measured(self):
+        self._measured_points = len(self.points)
+        self._last_point = self.points[-1].copy() if self.has_points() else None
+
+    def update_path(self, mob, dt):
+        if self.bounded:
+            self._update_bounded_path(dt)
+            return
+        in_sync = self._in_sync()
+        last_point = self._last_point
+        super().update_path(mob, dt)
+        if in_sync:
+            if last_point is not None:
+                self._length += np.linalg.norm(self.points[-1] - last_point)
+            self._mark_measured()
+
+    def _update_bounded_path(self, dt):
+        self._clock += dt
+        point = np.array(self.traced_point_func(), dtype=float)
+        if self._count:
+            last = self._live_vertices()[-1]
+            step = np.linalg.norm(point - last)
+            if step == 0:
+                # The point has not moved, so there is nothing new to trace
+                point = None
+            else:
+                self._length += step
+        if point is not None:
+            if self.decimate and self._extends_last_segment(point):
+                self._set_vertex(self._count - 1, point, self._clock)
+            else:
+                self._push(point, self._clock)
+        if self.time_window is not None:
+            self._trim()
+        self._write_points()
+
+    def reset(self):
+        """Clear the path and its length."""
+        self.clear_points()
+        self._length = 0.0
+        self._mark_measured()
+        if self.bounded:
+            self._start = 0
+            self._count = 0
+
+    def recompute_length(self):
+        points = self.get_points()
+        self._length = float(np.linalg.norm(np.diff(points, axis=0), axis=1).sum())
+        self._mark_measured()
+        return self._length
+
+    def get_length(self):
+        if not self.bounded and not self._in_sync():
+            return self.recompute_length()
+        return self._length
 
 
 class Photon(Dot):
     def __init__(
-        self, position: Vector3D, direction: Vector3D, *args, **kwargs
+        self,
+        position: Vector3D,
+        direction: Vector3D,
+        *args,
+        trace_config: dict | None = None,
+        **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self.move_to(position)
         self.direction = direction
-        # Create path tracker
-        self.trace = TracedPath(
+        # Create path tracker; see PhotonTrace for bounded trace options
+        self.trace = PhotonTrace(
             self.get_center,
-            stroke_width=2,
-            stroke_color=YELLOW,
-            stroke_opacity=0.7,
+            **{
+                "stroke_width": 2,
+                "stroke_color": YELLOW,
+                "stroke_opacity": 0.7,
+                **(trace_config or {}),
+            },
         )
 
     def get_distance_traveled(self):
-        points = self.trace.get_points()
-        return sum(
-            np.linalg.norm(points[i] - points[i - 1])
-            for i in range(1, len(points))
-        )
+        return self.trace.get_length()
 
     def clear_trace(self):
-        self.trace.clear_points()
+        self.trace.reset()
 
 
 class LightClock(VGroup):
+    """Two mirrored walls with a photon bouncing between them.
+
+    By default the photon, the trace and the clock face each follow
+    `proper_time` through their own updaters. With `analytic=True` a single
+    updater on the light clock computes the photon and clock state in closed
+    form from `proper_time`, and only re-reads the wall positions when the
+    walls have moved.
+    """
+
+    # Seconds of proper time for the photon to cross between the walls
+    BOUNCE_PERIOD = 0.5
+
     def __init__(
         self,
         *args,
@@ -41,40 +257,57 @@ class LightClock(VGroup):
         color=WHITE,
         symbol="\\tau",
         use_symbol_for_value=True,
+        trace_config=None,
+        analytic=False,
+        batch_hatches=False,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
+        self.analytic = analytic
         self.proper_time = ValueTracker(0)
         self.initial_position = initial_position
         position = initial_position
-        # Create walls using the provided function
-        self.walls = TwoOpposingWalls(
-            first_midpoint=position + UP * height / 2,
-            second_midpoint=position + DOWN * height / 2,
-            wall_width=wall_width,
-            hatch_length=hatch_length,
-            color=color,
+        # Create walls using the provided function. They are built around
+        # the origin and colored after copying, so clocks at different
+        # positions and in different colors share one prototype.
+        self.walls = (
+            cached(
+                TwoOpposingWalls,
+                first_midpoint=UP * height / 2,
+                second_midpoint=DOWN * height / 2,
+                wall_width=wall_width,
+                hatch_length=hatch_length,
+                batch_hatches=batch_hatches,
+            )
+            .set_color(color)
+            .shift(position)
         )
         self.wall_separation_distance = np.linalg.norm(
             x=self.walls[0][0].get_bottom() - self.walls[1][0].get_top()
         )
         self.photon = Photon(
-            position=self.photon_position(0), direction=UP, color=YELLOW
-        ).add_updater(
-            update_function=lambda m: m.move_to(
-                self.photon_position(self.proper_time.get_value())
-            )
-        )
-        self.indicator = (
-            AnalogClock(
-                color=color,
-                decimal_places=2,
-                symbol=symbol,
-                use_symbol_for_value=use_symbol_for_value,
-            )
-            .next_to(self.walls[1][0], DOWN)
-            .add_updater(self.update_indicator)
-        )
+            position=self.photon_position(0),
+            direction=UP,
+            color=YELLOW,
+            trace_config=trace_config,
+        )
+        # Not cached: clocks differ in their symbol, and manim already reuses
+        # the parsed TeX of a symbol it has seen
+        self.indicator = AnalogClock(
+            color=color,
+            decimal_places=2,
+            symbol=symbol,
+            use_symbol_for_value=use_symbol_for_value,
+        ).next_to(self.walls[1][0], DOWN)
+
+        if analytic:
+            self._init_analytic_state()
+            # Also clears the updater on the clock's value display
+            self.indicator.clear_updaters()
+            self.add_updater(self.update_analytic)
+        else:
+            self.photon.add_updater(self.update_photon)
+            self.indicator.add_updater(self.update_indicator)
 
         # Include the walls, photon, indicator, and trace in self.elements
         self.add(
@@ -92,7 +325,7 @@ class LightClock(VGroup):
 
     def photon_position(self, proper_time: float):
         # Use a repeating bounce rather than resetting at each integer time:
-        period = 0.5
+        period = self.BOUNCE_PERIOD
         cycles = int(proper_time // period)
         remainder = (proper_time % period) / period
         start = self.walls[1][0].get_center()
@@ -103,13 +336,74 @@ class LightClock(VGroup):
         else:
             return interpolate(end, start, remainder)
 
+    def update_photon(self, mobj):
+        mobj.move_to(self.photon_position(self.proper_time.get_value()))
+
     def update_indicator(self, mobj):
         proper_time = self.proper_time.get_value()
         mobj.accumulated_time.set_value(proper_time)
         mobj.next_to(self.walls[1][0], DOWN)
 
+    @classmethod
+    def bounce_fraction(cls, proper_time):
+        """How far the photon is from the bottom wall to the top, in [0, 1].
+
+        A triangle wave equivalent to `photon_position`'s bounce, which also
+        accepts arrays of times.
+        """
+        phase = np.mod(np.asarray(proper_time) / cls.BOUNCE_PERIOD, 2)
+        return 1 - np.abs(1 - phase)
+
+    def _wall_lines(self):
+        return self.walls[1][0], self.walls[0][0]
+
+    def _init_analytic_state(self):
+        # Wall line endpoints as of the last frame, to spot when they move
+        self._wall_anchors = np.zeros((4, 3))
+        # Rows: bottom wall center, top wall center, indicator offset
+        self._anchors = np.zeros((3, 3))
+        bottom_center = self._wall_lines()[0].get_center()
+        self._anchors[2] = self.indicator.get_center() - bottom_center
+        self._indicator_center = self.indicator.get_center()
+        # Weights that turn the anchors into the photon and indicator positions
+        self._weights = np.array([[1.0, 0.0, 0.0], [1.0, 0.0, 1.0]])
+        self._refresh_wall_anchors()
+
+    def _refresh_wall_anchors(self):
+        bottom, top = self._wall_lines()
+        anchors = self._wall_anchors
+        if (
+            np.array_equal(anchors[0], bottom.points[0])
+            and np.array_equal(anchors[1], bottom.points[-1])
+            and np.array_equal(anchors[2], top.points[0])
+            and np.array_equal(anchors[3], top.points[-1])
+        ):
+            return
+        anchors[0] = bottom.points[0]
+        anchors[1] = bottom.points[-1]
+        anchors[2] = top.points[0]
+        anchors[3] = top.points[-1]
+        # The center of a straight wall is the midpoint of its endpoints
+        self._anchors[0] = (anchors[0] + anchors[1]) / 2
+        self._anchors[1] = (anchors[2] + anchors[3]) / 2
+
+    def update_analytic(self, mobj, dt):
+        proper_time = self.proper_time.get_value()
+        self._refresh_wall_anchors()
+        fraction = self.bounce_fraction(proper_time)
+        weights = self._weights
+        weights[0, 0] = 1 - fraction
+        weights[0, 1] = fraction
+        photon_position, indicator_center = weights @ self._anchors
+
+        self.photon.move_to(photon_position)
+        if not np.array_equal(indicator_center, self._indicator_center):
+            self.indicator.shift(indicator_center - self._indicator_center)
+            self._indicator_center = indicator_center
+        self.indicator.set_time(proper_time, center=indicator_center)
+
 
-class TimeDilationDemo(Scene):
+class TimeDilationDemo(SandboxScene):
     def construct(self):
         CLOCK_HEIGHT = 4
         WALL_WIDTH = 1
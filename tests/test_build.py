@@ -0,0 +1,51 @@
+from pathlib import Path
+
+from manim_sandbox.mmake import build
+from manim_sandbox.mmake.build import build_scenes
+from manim_sandbox.mmake.encode import output_path
+from manim_sandbox.mmake.graph import ImportGraph
+from manim_sandbox.mmake.manifest import BuildManifest
+from manim_sandbox.mmake.render import RenderResult, RenderSettings
+from manim_sandbox.mmake.scenes import SceneJob
+
+
+def test_a_ladder_build_does_not_reuse_a_plain_build(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = Path("project/figures.py")
+    source.parent.mkdir()
+    source.write_text("")
+    scene = SceneJob("project", source, "Figure")
+    movie = RenderSettings("mp4", "m")
+    project_dir = Path("output/project")
+    tier_dir = project_dir / "medium_quality"
+    renders = []
+
+    def render_scene(scene, settings, media_dir, capture_output=False, **options):
+        renders.append((media_dir, options.get("shared_dir")))
+        path = output_path(scene, settings, media_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"movie")
+        return RenderResult(scene, 0, 1.0, artifacts=[path])
+
+    monkeypatch.setattr(build, "render_scene", render_scene)
+    options = dict(
+        formats=[movie],
+        output_dir=Path("output"),
+        graph=ImportGraph(Path(".")),
+        config_file=Path("manim.cfg"),
+    )
+    build_scenes([scene], **options)
+    [ladder] = build_scenes([scene], qualities=["m"], **options)
+
+    assert not ladder.cached
+    assert ladder.artifacts == [output_path(scene, movie, tier_dir)]
+    # The tier renders into its own folder, with the project's TeX cache
+    assert renders == [(project_dir, None), (tier_dir, project_dir)]
+    assert set(BuildManifest(project_dir).scene(scene.id)["renders"]) == {
+        "mp4-m",
+        "medium_quality/mp4-m",
+    }
+
+    [again] = build_scenes([scene], qualities=["m"], **options)
+    assert again.cached
+    assert again.artifacts == ladder.artifacts
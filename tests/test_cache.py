@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from manim_sandbox.mmake import render
+from manim_sandbox.mmake.cache import BuildCache
+from manim_sandbox.mmake.graph import ImportGraph
+from manim_sandbox.mmake.render import RenderSettings
+from manim_sandbox.mmake.scenes import SceneJob
+
+
+def key(tmp_path: Path, settings: RenderSettings) -> str:
+    source = tmp_path / "figures.py"
+    source.write_text("")
+    cache = BuildCache(tmp_path, ImportGraph(tmp_path), tmp_path / "manim.cfg")
+    return cache.key(SceneJob("project", source, "Figure"), settings)
+
+
+def test_gifs_are_rebuilt_when_the_encoder_changes(tmp_path, monkeypatch):
+    gif = RenderSettings.for_format("gif")
+    before = key(tmp_path, gif)
+    monkeypatch.setattr(render, "GIF_ENCODER_VERSION", render.GIF_ENCODER_VERSION + 1)
+    assert key(tmp_path, gif) != before
+
+
+def test_other_formats_do_not_depend_on_the_gif_encoder(tmp_path, monkeypatch):
+    mp4 = RenderSettings.for_format("mp4")
+    before = key(tmp_path, mp4)
+    monkeypatch.setattr(render, "GIF_ENCODER_VERSION", render.GIF_ENCODER_VERSION + 1)
+    assert key(tmp_path, mp4) == before
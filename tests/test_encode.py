@@ -0,0 +1,85 @@
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from manim_sandbox.mmake.encode import output_path, quality_size, render_formats
+from manim_sandbox.mmake.render import RenderResult, RenderSettings
+from manim_sandbox.mmake.scenes import SceneJob
+
+SCENE = SceneJob("project", Path("project/figures.py"), "Figure")
+
+
+def fake_render(media_dir: Path):
+    def render(scene, settings):
+        movie = output_path(scene, settings, media_dir)
+        return RenderResult(scene, 0, 1.0, "", [movie], peak_memory=123)
+
+    return render
+
+
+def test_render_formats_keeps_peak_memory(tmp_path):
+    formats = [RenderSettings("mp4", "m")]
+    result = render_formats(SCENE, formats, tmp_path, fake_render(tmp_path))
+    assert result.ok
+    assert result.peak_memory == 123
+    assert result.artifacts == [output_path(SCENE, formats[0], tmp_path)]
+
+
+def test_render_formats_keeps_peak_memory_of_failed_encodes(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", "")
+    formats = [RenderSettings("mp4", "m"), RenderSettings("mp4", "l")]
+    result = render_formats(SCENE, formats, tmp_path, fake_render(tmp_path))
+    assert not result.ok
+    assert result.peak_memory == 123
+
+
+def frame_render(media_dir: Path, calls: list):
+    """A render that saves a blank last frame at its quality's size."""
+    Image = pytest.importorskip("PIL.Image")
+
+    def render(scene, settings):
+        calls.append(settings)
+        result = fake_render(media_dir)(scene, settings)
+        if settings.last_frame:
+            height, _ = quality_size(settings.quality)
+            frame = output_path(scene, RenderSettings("png"), media_dir)
+            frame.parent.mkdir(parents=True)
+            Image.new("RGBA", (height * 16 // 9, height)).save(frame)
+            result.artifacts.append(frame)
+        return result
+
+    return render
+
+
+def test_render_formats_scales_stills_from_the_last_frame(tmp_path):
+    from PIL import Image
+
+    calls = []
+    movie, still = RenderSettings("mp4", "h"), RenderSettings("png", "m")
+    render = frame_render(tmp_path, calls)
+    result = render_formats(SCENE, [movie, still], tmp_path, render)
+    assert result.ok, result.output
+    # One render, which saves its last frame for the still
+    assert calls == [replace(movie, last_frame=True)]
+    assert result.artifacts == [
+        output_path(SCENE, movie, tmp_path),
+        output_path(SCENE, still, tmp_path),
+    ]
+    with Image.open(output_path(SCENE, still, tmp_path)) as image:
+        assert image.size == (1280, 720)
+
+
+def test_render_formats_raises_the_movie_to_the_still_quality(tmp_path):
+    calls = []
+    gif, still = RenderSettings("gif", "m"), RenderSettings("png", "k")
+    render_formats(SCENE, [gif, still], tmp_path, frame_render(tmp_path, calls))
+    assert calls == [RenderSettings("mp4", "k", last_frame=True)]
+
+
+def test_render_formats_renders_a_lone_still_directly(tmp_path):
+    calls = []
+    still = RenderSettings("png", "k")
+    result = render_formats(SCENE, [still], tmp_path, frame_render(tmp_path, calls))
+    assert result.ok
+    assert calls == [still]
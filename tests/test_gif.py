@@ -0,0 +1,85 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from manim_sandbox.mmake import gif  # noqa: E402
+from manim_sandbox.mmake.gif import GifWriter  # noqa: E402
+
+WIDTH, HEIGHT = 40, 30
+
+
+def frame(step: int) -> np.ndarray:
+    """A still green block and a red square that moves with `step`."""
+    pixels = np.zeros((HEIGHT, WIDTH, 3), np.uint8)
+    pixels[20:28, 2:10] = (0, 200, 0)
+    pixels[4:10, 3 * step : 3 * step + 6] = (220, 30, 30)
+    return pixels
+
+
+def read_gif(path):
+    with Image.open(path) as image:
+        frames, durations = [], []
+        for index in range(image.n_frames):
+            image.seek(index)
+            frames.append(np.asarray(image.convert("RGB")))
+            durations.append(image.info["duration"])
+        return frames, durations, image.info.get("loop")
+
+
+def write_gif(path, runs, **options):
+    writer = GifWriter(path, (WIDTH, HEIGHT), 10, **options)
+    for pixels, count in runs:
+        writer.write(pixels, count)
+    writer.close()
+
+
+def test_round_trip(tmp_path):
+    # The repeated frame has an empty diff and is written as one clear pixel
+    runs = [(frame(0), 1), (frame(1), 3), (frame(1), 1), (frame(2), 2)]
+    path = tmp_path / "figure.gif"
+    write_gif(path, runs)
+
+    frames, durations, loop = read_gif(path)
+    assert loop == 0
+    assert durations == [100, 300, 100, 200]
+    for decoded, (pixels, _) in zip(frames, runs, strict=True):
+        np.testing.assert_array_equal(decoded, pixels)
+    assert not list(tmp_path.glob(".figure-*"))
+
+
+def test_round_trip_in_a_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(gif, "FRAMES_PER_CHUNK", 2)
+    monkeypatch.setattr(gif, "MIN_POOL_CHUNKS", 2)
+    runs = [(frame(step), step % 3 + 1) for step in range(9)]
+    path = tmp_path / "figure.gif"
+    write_gif(path, runs, workers=2)
+
+    frames, durations, _ = read_gif(path)
+    assert durations == [100 * count for _, count in runs]
+    for decoded, (pixels, _) in zip(frames, runs, strict=True):
+        np.testing.assert_array_equal(decoded, pixels)
+
+
+def test_frames_are_sampled_at_the_output_rate(tmp_path):
+    path = tmp_path / "figure.gif"
+    writer = GifWriter(path, (WIDTH, HEIGHT), 15, source_rate=60)
+    for step in range(60):
+        writer.write(frame(step % 10))
+    writer.close()
+
+    frames, durations, _ = read_gif(path)
+    assert len(frames) == 15
+    # Delays round to 7 or 6 hundredths, but add up to the second
+    assert sum(durations) == 1000
+    np.testing.assert_array_equal(frames[1], frame(4))
+
+
+def test_colors_are_capped(tmp_path):
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 256, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+    path = tmp_path / "figure.gif"
+    write_gif(path, [(noise, 1)], colors=16)
+
+    frames, _, _ = read_gif(path)
+    assert len(np.unique(frames[0].reshape(-1, 3), axis=0)) <= 15
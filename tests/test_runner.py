@@ -0,0 +1,83 @@
+import time
+from pathlib import Path
+
+from manim_sandbox.mmake.render import RenderResult
+from manim_sandbox.mmake.runner import MAX_SKIPS, run_jobs, summarize
+from manim_sandbox.mmake.scenes import SceneJob
+
+SCENES = [
+    SceneJob("project", Path("project/figures.py"), name)
+    for name in ("First", "Broken", "Last")
+]
+
+
+def render(scene):
+    if scene.name == "Broken":
+        raise RuntimeError("ffmpeg went away")
+    return RenderResult(scene, 0, 1.0)
+
+
+def test_a_raising_render_fails_only_its_scene():
+    results = run_jobs(SCENES, render, jobs=2)
+    assert [result.ok for result in results] == [True, False, True]
+    assert results[1].scene == SCENES[1]
+    assert "ffmpeg went away" in results[1].output
+    assert summarize(results) == [results[1]]
+
+
+def test_a_raising_callback_fails_only_its_scene():
+    handled = []
+
+    def on_result(result):
+        if result.scene.name == "First":
+            raise OSError("disk full")
+        handled.append(result.scene)
+
+    results = run_jobs(SCENES[::2], render, on_result=on_result)
+    assert [result.ok for result in results] == [False, True]
+    assert "disk full" in results[0].output
+    assert handled == [SCENES[2]]
+
+
+def test_failures_are_made_by_the_failure_factory():
+    jobs = [("l", scene) for scene in SCENES]
+    results = run_jobs(
+        jobs,
+        lambda job: render(job[1]),
+        failure=lambda job, output, duration: RenderResult(
+            job[1], 1, duration, output, tier=job[0]
+        ),
+    )
+    assert results[1].label == "project:figures:Broken [l]"
+    assert not results[1].ok
+
+
+
+def scheduled(jobs, memory, group=None):
+    """The order `jobs` start in, with the first one holding on for a while."""
+    started = []
+    first = jobs[0]
+
+    def render(job):
+        started.append(job)
+        if job == first:
+            time.sleep(0.3)
+        return RenderResult(SCENES[0], 0, 0.0)
+
+    run_jobs(jobs, render, jobs=2, memory=memory, memory_budget=10, group=group)
+    return started
+
+
+def test_smaller_renders_only_skip_the_next_one_a_few_times():
+    jobs = ["first", "large", *(f"small{index}" for index in range(5))]
+    memory = {"first": 6, "large": 6, **{job: 1 for job in jobs[2:]}}
+    started = scheduled(jobs, memory)
+    skipped = jobs[2 : 2 + MAX_SKIPS]
+    assert started[: MAX_SKIPS + 2] == ["first", *skipped, "large"]
+
+
+def test_renders_only_skip_ahead_within_their_group():
+    jobs = [("l", "first"), ("l", "large"), ("m", "small")]
+    memory = {("l", "first"): 6, ("l", "large"): 6, ("m", "small"): 1}
+    started = scheduled(jobs, memory, group=lambda job: job[0])
+    assert started == jobs
@@ -0,0 +1,56 @@
+import pytest
+
+from manim_sandbox.mmake.segments import segment_overrides, split_ranges
+
+
+@pytest.mark.parametrize(
+    "durations, segments, expected",
+    [
+        ([1, 1], 2, [(0, 2)]),
+        ([10, 1, 1], 2, [(0, 2), (2, 3)]),
+        ([1, 1, 1, 1], 4, [(0, 2), (2, 3), (3, 4)]),
+        ([1, 1, 1, 1, 1, 1], 3, [(0, 2), (2, 4), (4, 6)]),
+        ([0, 0, 0], 2, [(0, 2), (2, 3)]),
+        ([3], 4, [(0, 1)]),
+    ],
+)
+def test_split_ranges(durations, segments, expected):
+    assert split_ranges(durations, segments) == expected
+
+
+@pytest.mark.parametrize("count", range(1, 12))
+@pytest.mark.parametrize("segments", range(1, 6))
+def test_split_ranges_cover_every_animation(count, segments):
+    ranges = split_ranges([1.0] * count, segments)
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == count
+    for (_, stop), (next_first, _) in zip(ranges, ranges[1:]):
+        assert stop == next_first
+    assert all(first < stop for first, stop in ranges)
+    if len(ranges) > 1:
+        assert ranges[0][1] >= 2
+
+
+@pytest.mark.parametrize("count", range(1, 12))
+@pytest.mark.parametrize("segments", range(1, 6))
+def test_segment_overrides_bound_every_range_but_the_last(count, segments):
+    ranges = split_ranges([1.0] * count, segments)
+    for first, stop in ranges:
+        overrides = segment_overrides(first, stop, count)
+        assert overrides["from_animation_number"] == first
+        if stop < count:
+            # manim ignores a falsy limit, which would render to the end
+            assert overrides["upto_animation_number"] == stop - 1
+            assert overrides["upto_animation_number"]
+        else:
+            assert "upto_animation_number" not in overrides
+
+
+def test_segment_overrides():
+    assert segment_overrides(0, 2, 5) == {
+        "from_animation_number": 0,
+        "upto_animation_number": 1,
+    }
+    assert segment_overrides(2, 5, 5) == {"from_animation_number": 2}
+    with pytest.raises(ValueError):
+        segment_overrides(0, 1, 5)
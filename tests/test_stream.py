@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import pytest
+
+from manim_sandbox.mmake.render import RenderSettings
+from manim_sandbox.mmake.scenes import SceneJob
+
+pytest.importorskip("manim")
+
+from manim_sandbox.mmake.stream import render_streaming  # noqa: E402
+
+STILL_SCENE = """\
+from manim import *
+
+
+class Still(Scene):
+    def construct(self):
+        self.add(Square())
+"""
+
+
+def test_a_scene_without_plays_streams_its_final_frame(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    Path("stills.py").write_text(STILL_SCENE)
+    scene = SceneJob("project", Path("stills.py"), "Still")
+    formats = [RenderSettings("gif", "l"), RenderSettings("png", "l")]
+    result = render_streaming(scene, formats, Path("media"), quiet=True)
+    assert result.ok, result.output
+    assert [path.suffix for path in result.artifacts] == [".gif", ".png"]
+    assert all(path.exists() for path in result.artifacts)
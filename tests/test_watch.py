@@ -0,0 +1,28 @@
+from manim_sandbox.mmake.watch import snapshot
+
+
+def test_snapshot_skips_what_is_not_a_regular_file(tmp_path):
+    scene = tmp_path / "scene.py"
+    scene.write_text("")
+    # Emacs marks unsaved buffers with a link to a file that does not exist
+    (tmp_path / ".#scene.py").symlink_to("someone@host.1234:1700000000")
+    (tmp_path / "package.py").mkdir()
+    (tmp_path / "link.py").symlink_to(scene)
+
+    assert set(snapshot([tmp_path])) == {scene, tmp_path / "link.py"}
+
+
+def test_snapshot_skips_files_deleted_while_walking(tmp_path, monkeypatch):
+    kept, deleted = tmp_path / "kept.py", tmp_path / "deleted.py"
+    kept.write_text("")
+    deleted.write_text("")
+    rglob = type(tmp_path).rglob
+
+    def deleting_rglob(self, pattern):
+        for path in rglob(self, pattern):
+            if path == deleted:
+                path.unlink()
+            yield path
+
+    monkeypatch.setattr(type(tmp_path), "rglob", deleting_rglob)
+    assert set(snapshot([tmp_path])) == {kept}